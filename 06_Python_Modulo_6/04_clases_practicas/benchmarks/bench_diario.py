@@ -0,0 +1,77 @@
+# benchmarks/bench_diario.py
+#
+# Rendimiento de escritura del diario (WAL) de todo_api con group commit
+# activado y desactivado: `clientes` tareas concurrentes guardan tareas sin
+# parar, y cada guardado espera a que su registro esté en disco (fsync), igual
+# que POST /api/tareas/. Después mide la recuperación al arrancar: reaplicar el
+# diario completo frente a cargar el snapshot que deja la compactación.
+# Uso (desde 04_clases_practicas): python benchmarks/bench_diario.py [clientes] [guardados_por_cliente] [directorio]
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE, "ejercicio_cinco", "todo_api"))
+from persistencia import Diario
+
+def tarea(i: int) -> dict:
+    return {"titulo": f"Tarea {i}", "descripcion": "Descripción de prueba", "estado": "pendiente"}
+
+async def escribir(diario: Diario, clientes: int, guardados: int) -> list:
+    latencias = []
+
+    async def cliente(n: int):
+        for i in range(guardados):
+            inicio = time.perf_counter()
+            await diario.guardar(str(uuid.uuid4()), tarea(n * guardados + i))
+            latencias.append(time.perf_counter() - inicio)
+
+    await asyncio.gather(*(cliente(n) for n in range(clientes)))
+    return latencias
+
+def medir_escritura(directorio: str, group_commit: bool, clientes: int, guardados: int):
+    shutil.rmtree(directorio, ignore_errors=True)
+    # Sin snapshots durante la medición: solo el coste de añadir al diario
+    diario = Diario({}, directorio, group_commit=group_commit, snapshot_cada=10 ** 9)
+    diario.abrir()
+    inicio = time.perf_counter()
+    latencias = asyncio.run(escribir(diario, clientes, guardados))
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    total = clientes * guardados
+    print(f"group commit {'sí' if group_commit else 'no':<3} {total / segundos:>12,.0f} escr/s {diario.fsyncs:>9} fsyncs "
+          f"{total / diario.fsyncs:>8.1f} escr/fsync   p50 {latencias[len(latencias) // 2] * 1000:>7.2f} ms   "
+          f"p99 {latencias[int(len(latencias) * 0.99)] * 1000:>7.2f} ms")
+    return diario
+
+def medir_recuperacion(directorio: str, diario: Diario):
+    inicio = time.perf_counter()
+    registros = Diario({}, directorio).abrir()
+    print(f"recuperación desde el diario ({registros} registros): {(time.perf_counter() - inicio) * 1000:8.1f} ms")
+
+    asyncio.run(diario.cerrar())  # Compacta: snapshot + diario vacío
+    inicio = time.perf_counter()
+    recuperado = Diario({}, directorio)
+    recuperado.abrir()
+    print(f"recuperación desde el snapshot ({len(recuperado.estado)} tareas):  {(time.perf_counter() - inicio) * 1000:8.1f} ms")
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    guardados = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    directorio = os.path.join(sys.argv[3] if len(sys.argv) > 3 else tempfile.gettempdir(), "bench_diario")
+
+    print(f"{clientes} clientes x {guardados} guardados en {directorio}")
+    try:
+        medir_escritura(directorio, False, clientes, guardados)
+        diario = medir_escritura(directorio, True, clientes, guardados)
+        medir_recuperacion(directorio, diario)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_export.py
+#
+# Pico de memoria y tiempo hasta el primer byte al volcar todos los productos
+# de ejercicio_cuatro: lista completa de .model_dump() en una JSONResponse
+# (antes) frente a GET /productos/export, que envía NDJSON por lotes con
+# StreamingResponse. El cuerpo del streaming se consume y se descarta, como
+# haría el servidor al escribirlo en el socket.
+# Uso (desde 04_clases_practicas): python benchmarks/bench_export.py [tamaños...]
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+from fastapi.responses import JSONResponse
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE, "ejercicio_cuatro"))
+import main as cuatro
+
+def volcado_completo():
+    respuesta = JSONResponse(status_code=200, content={"exito": True, "productos": [
+        cuatro.ProductoRespuesta(id=pid, **d).model_dump() for pid, d in cuatro.productos.items()]})
+    return len(respuesta.body), None  # El primer byte sale cuando el cuerpo ya está completo
+
+async def volcado_streaming():
+    respuesta = await cuatro.exportar_productos()
+    inicio = time.perf_counter()
+    primer_byte = None
+    total = 0
+    async for bloque in respuesta.body_iterator:
+        if primer_byte is None:
+            primer_byte = time.perf_counter() - inicio
+        total += len(bloque)
+    return total, primer_byte
+
+def medir(funcion):
+    """(segundos, pico de memoria en MB, bytes enviados, segundos hasta el primer byte)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    if asyncio.iscoroutine(resultado):
+        resultado = asyncio.run(resultado)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total, primer_byte = resultado
+    return segundos, pico / 1024 / 1024, total, primer_byte if primer_byte is not None else segundos
+
+def main():
+    tamanos = [int(t) for t in sys.argv[1:]] or [10_000, 100_000, 500_000]
+
+    print(f"{'productos':>10} {'caso':<22} {'total (s)':>10} {'1er byte (ms)':>14} {'pico (MB)':>10} {'MB enviados':>12}")
+    for tamano in tamanos:
+        cuatro.productos.clear()
+        for i in range(tamano):
+            cuatro.productos[str(uuid.uuid4())] = {"nombre": f"Producto {i}", "precio": 20.0 + i}
+        for nombre, funcion in [("JSONResponse (antes)", volcado_completo), ("/productos/export", volcado_streaming)]:
+            segundos, pico, total, primer_byte = medir(funcion)
+            print(f"{tamano:>10} {nombre:<22} {segundos:>10.2f} {primer_byte * 1000:>14.1f} {pico:>10.1f} {total / 1024 / 1024:>12.1f}")
+
+if __name__ == "__main__":
+    main()
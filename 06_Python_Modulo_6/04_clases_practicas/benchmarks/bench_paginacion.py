@@ -0,0 +1,65 @@
+# benchmarks/bench_paginacion.py
+#
+# Coste de GET /productos/ (ejercicio_cuatro) según crece el almacén: la
+# colección completa en cada llamada (antes) frente a una página de `limit`
+# elementos, con y sin fields=. Se mide la primera página y una página profunda
+# (a mitad del almacén, a partir de su cursor): la primera no depende del
+# tamaño, pero como las claves son uuid la profunda avanza por las claves
+# anteriores y crece con él (mucho menos que la colección completa, porque no
+# lee ni serializa esos registros). Se llama al endpoint sin pasar por HTTP.
+# Uso (desde 04_clases_practicas): python benchmarks/bench_paginacion.py [limit] [iteraciones] [tamaños...]
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE, "ejercicio_cuatro"))
+import main as cuatro
+from paginacion import codificar_cursor
+
+def medir(funcion, iteraciones: int) -> float:
+    """Milisegundos promedio por llamada, junto con el tamaño de la respuesta"""
+    async def bucle():
+        for _ in range(iteraciones):
+            resultado = funcion()
+            if asyncio.iscoroutine(resultado):
+                resultado = await resultado
+        return len(resultado.body)
+    inicio = time.perf_counter()
+    tamano = asyncio.run(bucle())
+    return (time.perf_counter() - inicio) / iteraciones * 1000, tamano
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iteraciones = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    tamanos = [int(t) for t in sys.argv[3:]] or [1_000, 10_000, 100_000]
+
+    print(f"{'productos':>10} {'caso':<28} {'ms/llamada':>11} {'bytes':>10}")
+    for tamano in tamanos:
+        cuatro.productos.clear()
+        for i in range(tamano):
+            cuatro.productos[str(uuid.uuid4())] = {"nombre": f"Producto {i}", "precio": 20.0 + i}
+        mitad = tamano // 2
+        cursor_mitad = codificar_cursor(list(cuatro.productos)[mitad], mitad)
+
+        casos = [
+            ("colección completa (antes)", lambda: JSONResponse(status_code=200, content={"exito": True, "productos": [
+                cuatro.ProductoRespuesta(id=pid, **d).model_dump() for pid, d in cuatro.productos.items()]})),
+            (f"primera página limit={limit}", lambda: cuatro.obtener_productos(limit=limit)),
+            ("página a mitad (cursor)", lambda: cuatro.obtener_productos(limit=limit, cursor=cursor_mitad)),
+            ("página a mitad fields=precio", lambda: cuatro.obtener_productos(limit=limit, cursor=cursor_mitad, fields="precio")),
+        ]
+        pagina = json.loads(asyncio.run(casos[2][1]()).body)
+        assert len(pagina["productos"]) == min(limit, tamano - mitad - 1)
+        for nombre, funcion in casos:
+            ms, tamano_respuesta = medir(funcion, iteraciones)
+            print(f"{tamano:>10} {nombre:<28} {ms:>11.3f} {tamano_respuesta:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_repositorio_seis.py
+#
+# Latencia de obtener / actualizar / eliminar por ID en ejercicio_seis según
+# crece el número de registros: recorrido lineal de una lista (antes) frente al
+# Repositorio indexado por clave primaria (después). Con la lista el coste
+# crece con el tamaño; con el Repositorio la curva queda plana.
+# Uso (desde 04_clases_practicas): python benchmarks/bench_repositorio_seis.py [muestras] [tamaños...]
+
+import os
+import random
+import sys
+import time
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE, "ejercicio_seis"))
+from repositorio import Repositorio
+
+def registro(i: int) -> dict:
+    return {"username": f"usuario{i}", "email": f"usuario{i}@correo.com", "edad": 20 + i % 50}
+
+# --- Implementación anterior: lista + recorrido lineal ---
+
+def lista_obtener(db: list, user_id: int):
+    for user in db:
+        if user["user_id"] == user_id:
+            return user
+    return None
+
+def lista_actualizar(db: list, user_id: int, cambios: dict):
+    for user in db:
+        if user["user_id"] == user_id:
+            user.update(cambios)
+            return user
+    return None
+
+def lista_eliminar(db: list, user_id: int):
+    for user in db:
+        if user["user_id"] == user_id:
+            db.remove(user)
+            return user
+    return None
+
+def medir(funcion, ids: list) -> float:
+    """Microsegundos promedio por operación"""
+    inicio = time.perf_counter()
+    for registro_id in ids:
+        assert funcion(registro_id) is not None
+    return (time.perf_counter() - inicio) / len(ids) * 1_000_000
+
+def main():
+    muestras = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tamanos = [int(t) for t in sys.argv[2:]] or [1_000, 10_000, 100_000]
+
+    print(f"{'registros':>10} {'operación':<11} {'lista (µs)':>12} {'repositorio (µs)':>17} {'mejora':>9}")
+    for tamano in tamanos:
+        lista = [{**registro(i), "user_id": i} for i in range(1, tamano + 1)]
+        repo = Repositorio("user_id", unicos=("username", "email"))
+        for i in range(1, tamano + 1):
+            repo.crear(registro(i))
+
+        ids = random.sample(range(1, tamano + 1), min(muestras, tamano))
+        operaciones = [
+            ("obtener", lambda i: lista_obtener(lista, i), repo.obtener),
+            ("actualizar", lambda i: lista_actualizar(lista, i, {"edad": 99}), lambda i: repo.actualizar(i, {"edad": 99})),
+            ("eliminar", lambda i: lista_eliminar(lista, i), repo.eliminar),
+        ]
+        for nombre, antes, despues in operaciones:
+            t_antes = medir(antes, ids)
+            t_despues = medir(despues, ids)
+            print(f"{tamano:>10} {nombre:<11} {t_antes:>12.2f} {t_despues:>17.2f} {t_antes / t_despues:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
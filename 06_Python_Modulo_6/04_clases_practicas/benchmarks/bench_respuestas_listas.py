@@ -0,0 +1,120 @@
+# benchmarks/bench_respuestas_listas.py
+#
+# Microbenchmark de los endpoints de listado (ejercicio_tres, ejercicio_cuatro y
+# todo_api): construcción y codificación de la respuesta con JSONResponse +
+# .model_dump() (antes) frente a ORJSONResponse con los modelos directamente
+# (después). Se llama al endpoint sin pasar por HTTP para aislar la serialización.
+# Los listados piden una sola página con todos los elementos (limit, máx. 1000).
+# Uso (desde 04_clases_practicas): python benchmarks/bench_respuestas_listas.py [elementos] [iteraciones]
+
+import asyncio
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def olvidar_modulos(ruta: str):
+    """
+    Saca de sys.modules los módulos con el nombre de los .py de `ruta`: cada app
+    tiene su propia paginacion.py, respuestas.py, etc., y sin esto la siguiente
+    app importaría los de la anterior que quedaron en caché.
+    """
+    for archivo in os.listdir(ruta):
+        if archivo.endswith(".py"):
+            sys.modules.pop(archivo[:-3], None)
+
+def cargar(carpeta: str, modulo: str):
+    """Importa <carpeta>/<modulo>.py con un nombre único (todas las apps tienen main.py)"""
+    ruta = os.path.join(BASE, carpeta)
+    olvidar_modulos(ruta)
+    sys.path.insert(0, ruta)
+    try:
+        spec = importlib.util.spec_from_file_location(f"{carpeta.replace('/', '_')}_{modulo}", os.path.join(ruta, f"{modulo}.py"))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        sys.path.remove(ruta)
+
+def cuerpo(funcion) -> bytes:
+    resultado = funcion()
+    if inspect.isawaitable(resultado):
+        resultado = asyncio.run(resultado)
+    return resultado.body
+
+def medir(funcion, iteraciones: int) -> float:
+    """Microsegundos de CPU promedio por llamada (el cuerpo queda codificado al crear la respuesta)"""
+    async def bucle():
+        for _ in range(iteraciones):
+            resultado = funcion()
+            if inspect.isawaitable(resultado):
+                resultado = await resultado
+            assert resultado.body
+    inicio = time.process_time()
+    asyncio.run(bucle())
+    return (time.process_time() - inicio) / iteraciones * 1_000_000
+
+def casos(elementos: int) -> list:
+    """(nombre, función antes, función después) para cada endpoint de listado"""
+    tres = cargar("ejercicio_tres", "main")
+    for i in range(1, elementos + 1):
+        tres.articulos[i] = {"nombre": f"Articulo {i}", "descripcion": "Descripción de prueba", "precio": 10.5 + i, "impuesto": 0.21}
+
+    cuatro = cargar("ejercicio_cuatro", "main")
+    for i in range(elementos):
+        cuatro.productos[str(uuid.uuid4())] = {"nombre": f"Producto {i}", "precio": 20.0 + i}
+
+    todo_dir = os.path.join(BASE, "ejercicio_cinco", "todo_api")
+    olvidar_modulos(todo_dir)
+    sys.path.insert(0, todo_dir)
+    import data
+    import models
+    import routes
+    sys.path.pop(0)
+    for i in range(elementos):
+        data.tareas[str(uuid.uuid4())] = {"titulo": f"Tarea {i}", "descripcion": "Descripción de prueba", "estado": "pendiente"}
+
+    return [
+        (
+            "ejercicio_tres GET /articulos",
+            lambda: JSONResponse(status_code=200, content={"exito": True, "articulos": [
+                tres.ArticuloRespuesta(id=aid, **d).model_dump() for aid, d in tres.articulos.items()]}),
+            lambda: tres.obtener_todos_articulos(limit=elementos),
+        ),
+        (
+            "ejercicio_cuatro GET /productos/",
+            lambda: JSONResponse(status_code=200, content={"exito": True, "productos": [
+                cuatro.ProductoRespuesta(id=pid, **d).model_dump() for pid, d in cuatro.productos.items()]}),
+            lambda: cuatro.obtener_productos(limit=elementos),
+        ),
+        (
+            "todo_api GET /api/tareas/",
+            lambda: JSONResponse(status_code=200, content={"exito": True, "tareas": [
+                models.TareaRespuesta(id=tid, **d).model_dump() for tid, d in data.tareas.items()]}),
+            lambda: routes.obtener_tareas(limit=elementos),
+        ),
+    ]
+
+def main():
+    elementos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iteraciones = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"Elementos por lista: {elementos}, iteraciones: {iteraciones}")
+    for nombre, antes, despues in casos(elementos):
+        despues_json = json.loads(cuerpo(despues))
+        despues_json.pop("siguiente_cursor")
+        if json.loads(cuerpo(antes)) != despues_json:
+            raise SystemExit(f"{nombre}: las respuestas difieren")
+        t_antes = medir(antes, iteraciones)
+        t_despues = medir(despues, iteraciones)
+        print(f"{nombre:<34} antes: {t_antes:9.1f} µs   después: {t_despues:9.1f} µs   ({t_antes / t_despues:.2f}x)")
+
+if __name__ == "__main__":
+    main()
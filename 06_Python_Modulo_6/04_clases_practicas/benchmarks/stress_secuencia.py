@@ -0,0 +1,101 @@
+# benchmarks/stress_secuencia.py
+#
+# Prueba de estrés de la asignación de IDs: muchos hilos crean registros a la
+# vez en ejercicio_dos (POST /clientes), ejercicio_tres (POST /articulos/) y
+# ejercicio_seis (Repositorio de recursos), llamando a los handlers igual que
+# el threadpool de Starlette. Comprueba que no hay IDs repetidos ni huecos y
+# que cada hilo recibe IDs crecientes. Como referencia repite la prueba con el
+# patrón anterior (len(coleccion) + 1), que repite IDs bajo concurrencia.
+# Uso (desde 04_clases_practicas): python benchmarks/stress_secuencia.py [hilos] [altas_por_hilo]
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def cargar(carpeta: str, modulo: str):
+    """Importa <carpeta>/<modulo>.py con un nombre único (todas las apps tienen main.py)"""
+    ruta = os.path.join(BASE, carpeta)
+    sys.path.insert(0, ruta)
+    try:
+        spec = importlib.util.spec_from_file_location(f"{carpeta}_{modulo}", os.path.join(ruta, f"{modulo}.py"))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        sys.path.remove(ruta)
+        sys.modules.pop("secuencia", None)  # Cada app usa su propia copia
+
+def martillar(crear, hilos: int, altas: int) -> list:
+    """Lanza `hilos` hilos que llaman `altas` veces a crear(); devuelve los IDs de cada hilo"""
+    barrera = threading.Barrier(hilos)
+    resultados = [[] for _ in range(hilos)]
+
+    def trabajo(n: int):
+        barrera.wait()  # Todos empiezan a la vez
+        for _ in range(altas):
+            resultados[n].append(crear())
+
+    threads = [threading.Thread(target=trabajo, args=(n,)) for n in range(hilos)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return resultados
+
+def comprobar(nombre: str, resultados: list) -> bool:
+    ids = [i for por_hilo in resultados for i in por_hilo]
+    repetidos = len(ids) - len(set(ids))
+    crecientes = all(a < b for por_hilo in resultados for a, b in zip(por_hilo, por_hilo[1:]))
+    sin_huecos = sorted(set(ids)) == list(range(1, len(set(ids)) + 1))
+    ok = repetidos == 0 and crecientes and sin_huecos
+    print(f"{nombre:<32} ids: {len(ids):>7}  repetidos: {repetidos:>6}  crecientes: {crecientes!s:<5}  "
+          f"sin huecos: {sin_huecos!s:<5}  {'OK' if ok else 'FALLO'}")
+    return ok
+
+def len_mas_uno(tres):
+    """El patrón anterior de ejercicio_tres: articulo_id = len(articulos) + 1"""
+    articulos = {}
+    articulo = tres.ArticuloCrear(nombre="Mesa", precio=10.0)
+
+    def crear() -> int:
+        articulo_id = len(articulos) + 1
+        articulos[articulo_id] = articulo.model_dump()  # Otro hilo puede leer el mismo len() antes de guardar
+        return articulo_id
+    return crear
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    altas = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    sys.setswitchinterval(1e-6)  # Cambios de hilo muy frecuentes para provocar carreras
+
+    dos = cargar("ejercicio_dos", "main")
+    tres = cargar("ejercicio_tres", "main")
+    seis = cargar("ejercicio_seis", "main")
+
+    casos = [
+        ("ejercicio_dos POST /clientes",
+         lambda: dos.crear_cliente(dos.Cliente(id=0, nombre="Ana", edad=30)).id),
+        ("ejercicio_tres POST /articulos/",
+         lambda: json.loads(tres.crear_articulo(tres.ArticuloCrear(nombre="Mesa", precio=10.0)).body)["articulo"]["id"]),
+        ("ejercicio_seis Repositorio",
+         lambda: seis.db_recursos.crear({"nombre": "Recurso"})["item_id"]),
+    ]
+    print(f"{hilos} hilos x {altas} altas")
+    ok = True
+    for nombre, crear in casos:
+        ok &= comprobar(nombre, martillar(crear, hilos, altas))
+
+    # Ningún alta se ha pisado con otra en los almacenes
+    ok &= len(tres.articulos) == hilos * altas and len(dos.clientes_db) == hilos * altas
+
+    comprobar("referencia: len(articulos) + 1", martillar(len_mas_uno(tres), hilos, altas))
+
+    if not ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,15 @@
 from typing import Dict
+from persistencia import Diario
+import os
+
+# Directorio del diario (WAL) y los snapshots de las tareas
+TODO_DATA_DIR = os.getenv("TODO_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos"))
+# Agrupar en un solo fsync las escrituras concurrentes (group commit)
+TODO_WAL_GROUP_COMMIT = os.getenv("TODO_WAL_GROUP_COMMIT", "true").lower() in ("1", "true", "yes")
+# Registros del diario entre snapshots
+TODO_SNAPSHOT_CADA = int(os.getenv("TODO_SNAPSHOT_CADA", "10000"))
 
 tareas: Dict[str, dict] = {}
+
+# Las tareas guardadas no se modifican en el sitio: un cambio guarda un dict nuevo
+diario = Diario(tareas, TODO_DATA_DIR, group_commit=TODO_WAL_GROUP_COMMIT, snapshot_cada=TODO_SNAPSHOT_CADA)
@@ -1,7 +1,23 @@
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from routes import router as tareas_router
+from respuestas import ORJSONResponse
+from data import diario
+import logging
 
-app = FastAPI()
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Recupera las tareas del último snapshot más el diario escrito después
+    reaplicados = diario.abrir()
+    logger.info(f"{len(diario.estado)} tareas recuperadas ({reaplicados} registros del diario)")
+    yield
+    # Al cerrar se guarda un snapshot para que el próximo arranque sea inmediato
+    await diario.cerrar()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 @app.get("/")
 def root():
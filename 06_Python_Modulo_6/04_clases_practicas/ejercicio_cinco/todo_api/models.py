@@ -1,10 +1,12 @@
 from pydantic import BaseModel
 from typing import Optional, Literal
 
+EstadoTarea = Literal["pendiente", "en_progreso", "completada"]
+
 class TareaBase(BaseModel):
     titulo: str
     descripcion: Optional[str] = None
-    estado: Literal["pendiente", "en_progreso", "completada"] = "pendiente"
+    estado: EstadoTarea = "pendiente"
 
 class TareaCrear(TareaBase):
     pass
@@ -12,7 +14,7 @@ class TareaCrear(TareaBase):
 class TareaActualizar(BaseModel):
     titulo: Optional[str] = None
     descripcion: Optional[str] = None
-    estado: Literal["pendiente", "en_progreso", "completada"] = None
+    estado: EstadoTarea = None
 
 class TareaRespuesta(TareaBase):
     id: str
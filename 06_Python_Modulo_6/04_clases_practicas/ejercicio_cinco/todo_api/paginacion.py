@@ -0,0 +1,157 @@
+# Paginación por cursor, filtros y proyección de campos para los listados.
+#
+# Los listados devuelven como mucho `limit` elementos por llamada, así que el
+# tamaño de la respuesta y el coste de serializarla no dependen del tamaño del
+# almacén. El cursor es opaco para el cliente: guarda la clave del último
+# elemento devuelto y su posición en el orden de inserción.
+#
+# Cómo se reanuda la página siguiente depende del almacén:
+# - Lista: se salta por índice a esa posición y se comprueba que la clave sigue
+#   ahí; si se insertó o borró algo antes, se busca la clave, y si el propio
+#   elemento se eliminó se continúa desde la posición que ocupaba.
+# - Dict con claves enteras crecientes (IDs de una Secuencia que se asignan e
+#   insertan sin que otro hilo se cuele en medio, p. ej. desde handlers async,
+#   de modo que el orden de inserción es el de las claves): se consultan las
+#   claves posteriores a la última devuelta sin pasar por las anteriores; el
+#   coste es el de la página más los IDs borrados que haya en medio. Con
+#   handlers síncronos (threadpool) dos altas pueden insertarse en otro orden,
+#   así que esos almacenes usan la reanudación por posición.
+# - Cualquier otro dict (p. ej. claves uuid): un dict no permite saltar a una
+#   posición, así que se avanza por sus claves hasta ella, igual que con la
+#   lista en los demás casos. Es O(posición) aunque no lee los valores, de modo
+#   que las páginas profundas de un almacén muy grande cuestan más que la primera.
+
+import base64
+import itertools
+import json
+from typing import Any, Callable, Iterable, Optional
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+class ParametroInvalido(ValueError):
+    """Parámetro de listado incorrecto (limit, cursor o fields); se responde 400"""
+
+def codificar_cursor(clave: Any, posicion: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([clave, posicion]).encode()).decode()
+
+def decodificar_cursor(cursor: str) -> tuple:
+    try:
+        clave, posicion = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ParametroInvalido("Cursor inválido")
+    if isinstance(posicion, bool) or not isinstance(posicion, int) or posicion < 0:
+        raise ParametroInvalido("Cursor inválido")
+    return clave, posicion
+
+def _pares(registros, clave: Optional[Callable], inicio: int = 0) -> Iterable:
+    """(clave, registro) en orden desde la posición `inicio`: de un dict, o clave(registro) para una lista"""
+    if clave is None:
+        # Se avanza por las claves (sin crear las tuplas de items()) y se leen solo los valores recorridos
+        return ((k, registros[k]) for k in itertools.islice(registros, inicio, None))
+    return ((clave(registros[i]), registros[i]) for i in range(inicio, len(registros)))
+
+def _pares_tras_clave(registros: dict, ultima: int) -> Iterable:
+    """(clave, registro) con clave posterior a `ultima`, para dicts de claves enteras crecientes"""
+    if not registros:
+        return iter(())
+    # La primera y la última insertadas son la menor y la mayor: el recorrido no
+    # sale de las claves existentes aunque el cursor traiga un valor lejano
+    primera, fin = next(iter(registros)), next(reversed(registros))
+    return ((k, registros[k]) for k in range(max(ultima + 1, primera), fin + 1) if k in registros)
+
+def _reanudar(registros, clave: Optional[Callable], ultima: Any, posicion: int) -> int:
+    """Posición desde la que sigue la página posterior a `ultima`"""
+    primero = next(_pares(registros, clave, posicion), None)
+    if primero is not None and primero[0] == ultima:
+        return posicion + 1
+    for i, (k, _) in enumerate(_pares(registros, clave)):
+        if k == ultima:
+            return i + 1
+    return min(posicion, len(registros))  # Se eliminó: lo que le seguía ocupa ahora su posición
+
+def paginar(registros, limit: int = LIMITE_POR_DEFECTO, cursor: Optional[str] = None,
+            filtro: Optional[Callable[[Any], bool]] = None, clave: Optional[Callable] = None,
+            claves_crecientes: bool = False) -> tuple:
+    """
+    Devuelve (página, siguiente_cursor).
+
+    `registros` es un dict (la página son pares clave, registro) o una lista
+    junto con la función `clave` que da el identificador de cada registro.
+    Con claves_crecientes=True (dict de IDs enteros insertados en orden
+    creciente, ver el comentario del módulo) el cursor se reanuda por clave en
+    lugar de por posición.
+    siguiente_cursor es None en la última página.
+    """
+    if not 1 <= limit <= LIMITE_MAXIMO:
+        raise ParametroInvalido(f"limit debe estar entre 1 y {LIMITE_MAXIMO}")
+    inicio = 0
+    pares = None
+    if cursor:
+        ultima, posicion = decodificar_cursor(cursor)
+        if claves_crecientes:
+            if isinstance(ultima, bool) or not isinstance(ultima, int) or ultima < 0:
+                raise ParametroInvalido("Cursor inválido")
+            # La posición solo es orientativa: los borrados anteriores no se descuentan
+            inicio, pares = posicion + 1, _pares_tras_clave(registros, ultima)
+        else:
+            inicio = _reanudar(registros, clave, ultima, posicion)
+    if pares is None:
+        pares = _pares(registros, clave, inicio)
+
+    pagina = []
+    for posicion, (k, registro) in enumerate(pares, inicio):
+        if filtro is not None and not filtro(registro):
+            continue
+        if len(pagina) == limit:
+            return pagina, codificar_cursor(*ultimo)
+        pagina.append((k, registro))
+        ultimo = (k, posicion)
+    return pagina, None
+
+def recorrer(registros: dict, lote: int = 1000):
+    """
+    Recorre un dict completo por lotes de pares (clave, registro) sin copiarlo.
+
+    Pensado para exportaciones en streaming: entre lote y lote se atienden otras
+    peticiones, y si una alta o una baja cambia el tamaño del dict el iterador
+    deja de ser válido; en ese caso se retoma después de la última clave entregada.
+    """
+    inicio, ultimo = 0, None
+    while True:
+        bloque = []
+        try:
+            for posicion, par in enumerate(_pares(registros, None, inicio), inicio):
+                bloque.append(par)
+                ultimo = (par[0], posicion)
+                if len(bloque) == lote:
+                    yield bloque
+                    bloque = []
+        except RuntimeError:  # dictionary changed size during iteration
+            if bloque:
+                yield bloque
+            inicio = _reanudar(registros, None, *ultimo) if ultimo else 0
+            continue
+        if bloque:
+            yield bloque
+        return
+
+def rango(campo: str, minimo: Optional[float] = None, maximo: Optional[float] = None) -> Optional[Callable]:
+    """Filtro minimo <= registro[campo] <= maximo (None si no hay límites)"""
+    if minimo is None and maximo is None:
+        return None
+    return lambda registro: ((minimo is None or registro[campo] >= minimo)
+                             and (maximo is None or registro[campo] <= maximo))
+
+def parsear_campos(fields: Optional[str], permitidos: Iterable[str], obligatorios: tuple = ()) -> Optional[tuple]:
+    """'nombre,precio' -> ('nombre', 'precio'); None si no se pidió proyección"""
+    if not fields:
+        return None
+    campos = tuple(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+    desconocidos = [c for c in campos if c not in permitidos]
+    if desconocidos:
+        raise ParametroInvalido(f"Campos desconocidos: {', '.join(desconocidos)}")
+    return tuple(c for c in obligatorios if c not in campos) + campos
+
+def proyectar(registro: dict, campos: tuple) -> dict:
+    return {campo: registro[campo] for campo in campos}
@@ -0,0 +1,284 @@
+# Persistencia del dict de tareas: diario de escritura anticipada (WAL) + snapshots.
+#
+# Cada alta, cambio o baja se añade como una línea JSON al final del diario
+# (coste O(1), sin reescribir el resto). Con group commit, las escrituras que
+# llegan mientras otra espera a fsync se acumulan y se confirman juntas con un
+# único fsync; cada petición responde cuando su línea ya está en disco.
+#
+# Cada SNAPSHOT_CADA registros se guarda el dict completo en un snapshot y se
+# empieza un diario nuevo (generación siguiente); los diarios anteriores se
+# borran cuando el snapshot ya está en disco. Al arrancar se carga el snapshot y
+# se reaplican los diarios de su generación en adelante. Reaplicar un registro
+# que ya estaba en el snapshot no cambia nada (cada registro guarda la tarea
+# completa), así que un corte a mitad de una compactación no pierde datos.
+#
+# Si una escritura falla, el diario se trunca al tamaño que tenía antes de ella
+# (no quedan líneas de una petición que respondió con error) y el cambio se
+# deshace también en el dict. La compactación confirma o deshace lo pendiente
+# antes de copiar el dict, así que un snapshot nunca incluye un cambio fallido.
+
+import asyncio
+import logging
+import os
+import re
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_PATRON_DIARIO = re.compile(r"^diario-(\d+)\.wal$")
+
+_AUSENTE = object()  # Marca de "la clave no existía" al deshacer un cambio
+
+class DiarioCorrupto(Exception):
+    """Una línea intermedia del diario no se puede leer"""
+
+def _fsync_directorio(directorio: str):
+    """Hace durables las altas, renombrados y borrados de archivos del directorio"""
+    if os.name == "nt":  # En Windows no se puede abrir un directorio para fsync
+        return
+    fd = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class Diario:
+    """
+    Dict en memoria que persiste sus cambios en un directorio.
+
+    Los cambios se aplican primero al dict y después se registran: así el
+    snapshot, que copia el dict, incluye todo lo escrito en los diarios que borra.
+    Si el registro falla, el cambio se deshace en el dict.
+    """
+
+    def __init__(self, estado: dict, directorio: str, group_commit: bool = True,
+                 fsync: bool = True, snapshot_cada: int = 10000):
+        self.estado = estado
+        self.directorio = directorio
+        self.group_commit = group_commit
+        self.fsync = fsync
+        self.snapshot_cada = snapshot_cada
+        self.generacion = 0
+        self.fsyncs = 0  # Escrituras confirmadas en disco (para métricas y benchmarks)
+        self._archivo = None
+        self._pendientes = []  # (línea, future) a la espera del próximo fsync
+        self._vaciando = False
+        self._lock = asyncio.Lock()  # Una sola escritura o rotación de diario a la vez
+        self._desde_snapshot = 0
+        self._compactacion: Optional[asyncio.Task] = None
+
+    # --- Archivos ---
+
+    def _ruta_diario(self, generacion: int) -> str:
+        return os.path.join(self.directorio, f"diario-{generacion:08d}.wal")
+
+    @property
+    def _ruta_snapshot(self) -> str:
+        return os.path.join(self.directorio, "snapshot.json")
+
+    def _diarios(self) -> list:
+        """Generaciones de los diarios presentes, en orden"""
+        return sorted(int(m.group(1)) for m in map(_PATRON_DIARIO.match, os.listdir(self.directorio)) if m)
+
+    def _escribir(self, lineas: list):
+        if self._archivo is None:  # Falló el descarte de una escritura anterior
+            raise RuntimeError("El diario no está abierto")
+        inicio = self._archivo.tell()
+        try:
+            self._archivo.write(b"".join(lineas))
+            self._archivo.flush()
+            if self.fsync:
+                os.fsync(self._archivo.fileno())
+        except Exception:
+            self._descartar_desde(inicio)
+            raise
+        self.fsyncs += 1
+
+    def _descartar_desde(self, posicion: int):
+        """Quita del diario lo escrito desde posicion (una escritura fallida) y lo reabre"""
+        ruta = self._ruta_diario(self.generacion)
+        try:
+            self._archivo.close()  # Puede volver a fallar al vaciar el búfer; se trunca igual
+        except OSError:
+            pass
+        self._archivo = None  # Si no se puede truncar, no se escribe más en este diario
+        try:
+            os.truncate(ruta, posicion)
+        except OSError as e:
+            logger.error(f"{ruta}: no se pudo descartar una escritura fallida: {e}")
+            return
+        self._archivo = open(ruta, "ab")
+        if self.fsync:
+            os.fsync(self._archivo.fileno())
+
+    def _abrir_diario(self, generacion: int):
+        self._archivo = open(self._ruta_diario(generacion), "ab")
+        self.generacion = generacion
+        _fsync_directorio(self.directorio)
+
+    # --- Recuperación ---
+
+    def _reaplicar(self, generacion: int) -> int:
+        """Aplica un diario sobre el estado; una última línea incompleta (corte a mitad de escritura) se descarta"""
+        ruta = self._ruta_diario(generacion)
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+        aplicados = 0
+        fin = 0
+        while fin < len(contenido):
+            salto = contenido.find(b"\n", fin)
+            if salto == -1:
+                logger.warning(f"{ruta}: se descarta una escritura incompleta de {len(contenido) - fin} bytes")
+                with open(ruta, "r+b") as f:
+                    f.truncate(fin)
+                break
+            try:
+                registro = orjson.loads(contenido[fin:salto])
+            except orjson.JSONDecodeError:
+                raise DiarioCorrupto(f"{ruta}: línea ilegible en el byte {fin}")
+            if registro["op"] == "guardar":
+                self.estado[registro["id"]] = registro["valor"]
+            else:
+                self.estado.pop(registro["id"], None)
+            aplicados += 1
+            fin = salto + 1
+        return aplicados
+
+    def abrir(self) -> int:
+        """Carga el snapshot, reaplica los diarios y abre el diario actual; devuelve los registros reaplicados"""
+        os.makedirs(self.directorio, exist_ok=True)
+        self.estado.clear()
+        generacion = 0
+        if os.path.exists(self._ruta_snapshot):
+            with open(self._ruta_snapshot, "rb") as f:
+                snapshot = orjson.loads(f.read())
+            generacion = snapshot["generacion"]
+            self.estado.update(snapshot["estado"])
+
+        aplicados = 0
+        for g in self._diarios():
+            if g < generacion:  # Ya incluido en el snapshot (quedó de una compactación interrumpida)
+                os.remove(self._ruta_diario(g))
+                continue
+            aplicados += self._reaplicar(g)
+            generacion = g
+        self._desde_snapshot = aplicados
+        self._abrir_diario(generacion)
+        return aplicados
+
+    # --- Escritura ---
+
+    async def _registrar(self, registro: dict, deshacer):
+        """Escribe el registro; si falla, llama a deshacer() para revertir el cambio en el dict"""
+        if self._archivo is None:
+            deshacer()
+            raise RuntimeError("El diario no está abierto")
+        linea = orjson.dumps(registro) + b"\n"
+        confirmado = asyncio.get_running_loop().create_future()
+        self._pendientes.append((linea, confirmado, deshacer))
+        if not self._vaciando:
+            self._vaciando = True
+            asyncio.create_task(self._vaciar())
+        await confirmado
+
+        self._desde_snapshot += 1
+        if self._desde_snapshot >= self.snapshot_cada and self._compactacion is None:
+            self._compactacion = asyncio.create_task(self.compactar())
+
+    async def _vaciar(self):
+        """Tarea de fondo que escribe lo pendiente en cuanto el diario está libre"""
+        async with self._lock:
+            await self._vaciar_pendientes()
+            self._vaciando = False
+
+    async def _vaciar_pendientes(self):
+        """
+        Escribe lo pendiente hasta que no quede nada; se llama con self._lock tomado.
+
+        Con group commit cada lote (todo lo acumulado) va en un solo fsync; sin
+        él, cada registro lleva el suyo.
+        """
+        while self._pendientes:
+            if self.group_commit:
+                lote, self._pendientes = self._pendientes, []
+            else:
+                lote = [self._pendientes.pop(0)]
+            try:
+                await asyncio.to_thread(self._escribir, [linea for linea, _, _ in lote])
+            except Exception as e:
+                # En orden inverso: si el lote cambió varias veces la misma clave, queda el valor previo al lote
+                for _, _, deshacer in reversed(lote):
+                    deshacer()
+                for _, confirmado, _ in lote:
+                    confirmado.set_exception(e)
+                continue
+            for _, confirmado, _ in lote:
+                confirmado.set_result(None)
+
+    async def guardar(self, clave, valor: dict):
+        """Guarda (alta o reemplazo) y espera a que el cambio esté en disco"""
+        anterior = self.estado.get(clave, _AUSENTE)
+
+        def deshacer():
+            # Solo si ninguna petición posterior cambió la clave mientras tanto
+            if self.estado.get(clave) is valor:
+                if anterior is _AUSENTE:
+                    del self.estado[clave]
+                else:
+                    self.estado[clave] = anterior
+
+        self.estado[clave] = valor
+        await self._registrar({"op": "guardar", "id": clave, "valor": valor}, deshacer)
+
+    async def eliminar(self, clave):
+        """Elimina y espera a que la baja esté en disco; devuelve el valor eliminado"""
+        valor = self.estado.pop(clave)
+        await self._registrar({"op": "eliminar", "id": clave}, lambda: self.estado.setdefault(clave, valor))
+        return valor
+
+    # --- Snapshots ---
+
+    def _escribir_snapshot(self, copia: dict, generacion: int):
+        temporal = self._ruta_snapshot + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(orjson.dumps({"generacion": generacion, "estado": copia}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self._ruta_snapshot)  # Reemplazo atómico: nunca queda un snapshot a medias
+        _fsync_directorio(self.directorio)
+        for g in self._diarios():
+            if g < generacion:
+                os.remove(self._ruta_diario(g))
+
+    async def compactar(self):
+        """Guarda un snapshot del estado y descarta los diarios que ya incluye"""
+        try:
+            async with self._lock:
+                # Antes de copiar, lo pendiente se confirma o se deshace: el snapshot
+                # solo contiene cambios que ya están en el diario
+                await self._vaciar_pendientes()
+                copia = dict(self.estado)
+                generacion = self.generacion + 1
+                if self._archivo is not None:  # None si falló el descarte de una escritura
+                    self._archivo.close()
+                self._abrir_diario(generacion)
+                self._desde_snapshot = 0
+            await asyncio.to_thread(self._escribir_snapshot, copia, generacion)
+            logger.info(f"Snapshot de {len(copia)} registros (generación {generacion})")
+        except Exception as e:
+            logger.error(f"Error al compactar el diario: {e}")
+        finally:
+            self._compactacion = None
+
+    async def cerrar(self):
+        """Compacta (el próximo arranque solo lee el snapshot) y cierra el diario"""
+        if self._compactacion is not None:
+            await self._compactacion
+        if self._desde_snapshot:
+            await self.compactar()
+        async with self._lock:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
@@ -1,7 +1,11 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from models import TareaBase, TareaCrear, TareaActualizar, TareaRespuesta
-from data import tareas
+from fastapi.responses import StreamingResponse
+from respuestas import ORJSONResponse
+from models import EstadoTarea, TareaBase, TareaCrear, TareaActualizar, TareaRespuesta
+from data import tareas, diario
+from paginacion import ParametroInvalido, paginar, parsear_campos, proyectar, recorrer
+from typing import Optional
+import orjson
 import uuid
 
 router = APIRouter()
@@ -10,21 +14,22 @@ router = APIRouter()
 async def crear_tarea(tarea: TareaCrear):
     tarea_id = str(uuid.uuid4())
     nueva_tarea = tarea.model_dump()
-    tareas[tarea_id] = nueva_tarea
+    await diario.guardar(tarea_id, nueva_tarea)
     
-    return  JSONResponse(
+    return  ORJSONResponse(
         status_code=201,
         content={
             "exito": True,
             "mensaje": "Tarea Creada",
-            "tarea": TareaRespuesta(id=tarea_id, **nueva_tarea).model_dump()
+            "tarea": TareaRespuesta(id=tarea_id, **nueva_tarea)
         }
     )
 
 @router.get("/tareas/")
-async def obtener_tareas():
+async def obtener_tareas(limit: int = 100, cursor: Optional[str] = None,
+                         estado: Optional[EstadoTarea] = None, fields: Optional[str] = None):
     if not tareas:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exito":False,
@@ -33,23 +38,53 @@ async def obtener_tareas():
             }
         )
     
-    lista_tareas = [
-        TareaRespuesta(id=tid, **data).model_dump()
-        for tid, data in tareas.items()
-    ]
+    try:
+        campos = parsear_campos(fields, TareaBase.model_fields)
+        filtro = (lambda data: data["estado"] == estado) if estado else None
+        pagina, siguiente_cursor = paginar(tareas, limit, cursor, filtro)
+    except ParametroInvalido as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={
+                "exito":False,
+                "mensaje":str(e)
+            }
+        )
     
-    return JSONResponse(
+    if campos:
+        lista_tareas = [{"id": tid, **proyectar(data, campos)} for tid, data in pagina]
+    else:
+        lista_tareas = [TareaRespuesta(id=tid, **data) for tid, data in pagina]
+    
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito":True,
-            "tareas": lista_tareas
+            "tareas": lista_tareas,
+            "siguiente_cursor": siguiente_cursor
         }
     )
 
+@router.get("/tareas/export")
+async def exportar_tareas():
+    # Una tarea por línea (NDJSON), enviada por lotes mientras se recorre el dict:
+    # la memoria no crece con el número de tareas y el cliente empieza a leer antes
+    # de que termine. El generador es async para recorrer el dict en el hilo del
+    # event loop, donde las altas y bajas solo ocurren entre lote y lote.
+    async def lineas():
+        for bloque in recorrer(tareas):
+            yield b"".join(orjson.dumps({**data, "id": tid}) + b"\n" for tid, data in bloque)
+    
+    return StreamingResponse(
+        lineas(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tareas.ndjson"'}
+    )
+
 @router.get("/tareas/{tarea_id}")
 async def obtener_tarea(tarea_id: str):
     if tarea_id not in tareas:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exito":False,
@@ -57,18 +92,18 @@ async def obtener_tarea(tarea_id: str):
             }
         )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito":True,
-            "tarea": TareaRespuesta(id=tarea_id, **tareas[tarea_id]).model_dump()
+            "tarea": TareaRespuesta(id=tarea_id, **tareas[tarea_id])
         }
     )
 
 @router.put("/tareas/{tarea_id}")
 async def actualizar_tarea(tarea_id: str, tarea_actualizar: TareaActualizar):
     if tarea_id not in tareas:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exito":False,
@@ -76,24 +111,23 @@ async def actualizar_tarea(tarea_id: str, tarea_actualizar: TareaActualizar):
             }
         )
     
-    tarea_existente = tareas[tarea_id]
     datos_actualizados = tarea_actualizar.model_dump(exclude_unset=True)
-    tarea_existente.update(datos_actualizados)
-    tareas[tarea_id] = tarea_existente
+    tarea_existente = {**tareas[tarea_id], **datos_actualizados}
+    await diario.guardar(tarea_id, tarea_existente)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito":True,
             "mensaje": f"La tarea con ID {tarea_id} fue actualizada exitosamente",
-            "tarea": TareaRespuesta(id=tarea_id, **tarea_existente).model_dump()
+            "tarea": TareaRespuesta(id=tarea_id, **tarea_existente)
         }
     )
 
 @router.delete("/tareas/{tarea_id}")
 async def eliminar_tarea(tarea_id: str):
     if tarea_id not in tareas:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exito":False,
@@ -101,14 +135,14 @@ async def eliminar_tarea(tarea_id: str):
             }
         )
     
-    tarea_eliminada = tareas.pop(tarea_id)
+    tarea_eliminada = await diario.eliminar(tarea_id)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito":True,
             "mensaje":f"La tarea con el ID {tarea_id} ha sido eliminada satisfactoriamente",
-            "tarea":TareaRespuesta(id=tarea_id, **tarea_eliminada).model_dump()
+            "tarea":TareaRespuesta(id=tarea_id, **tarea_eliminada)
         }
     )
 
@@ -1,12 +1,16 @@
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+from respuestas import ORJSONResponse
+from paginacion import ParametroInvalido, paginar, parsear_campos, proyectar, rango, recorrer
 from pydantic import BaseModel
 from typing import Dict, Optional
 import uuid # Identificador Único Universal
+import orjson
 
 app = FastAPI(
     title="API de productos",
-    description="API para generar productos con FastAPI y Pydantic"
+    description="API para generar productos con FastAPI y Pydantic",
+    default_response_class=ORJSONResponse
 )
 
 # Modelo/Clase base => herencia de BaseModel
@@ -31,7 +35,7 @@ productos: Dict[str, dict] = {}
 
 @app.get("/")
 async def raiz():
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
@@ -45,19 +49,21 @@ async def crear_producto(producto: ProductoCrear):
     nuevo_producto = producto.model_dump() # objeto: nombre, precio => {"nombre": Luis, "precio": 45.20}
     productos[producto_id] = nuevo_producto # {"id": "ff4s5d4s8df56s4", {"nombre": Luis, "precio": 45.20}}
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=201,
         content={
             "exito": True,
             "mensaje": "Producto creado",
-            "producto": ProductoRespuesta(id=producto_id, **nuevo_producto).model_dump()
+            "producto": ProductoRespuesta(id=producto_id, **nuevo_producto)
         }
     )
     
 @app.get("/productos/")
-async def obtener_productos():
+async def obtener_productos(limit: int = 100, cursor: Optional[str] = None,
+                            precio_min: Optional[float] = None, precio_max: Optional[float] = None,
+                            fields: Optional[str] = None):
     if not productos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exitos": False,
@@ -66,23 +72,51 @@ async def obtener_productos():
             }
         )
     
-    lista_productos = [
-        ProductoRespuesta(id=pid, **data).model_dump()
-        for pid, data in productos.items()
-    ]
+    try:
+        campos = parsear_campos(fields, ProductoBase.model_fields)
+        pagina, siguiente_cursor = paginar(productos, limit, cursor, rango("precio", precio_min, precio_max))
+    except ParametroInvalido as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={
+                "exito": False,
+                "mensaje": str(e)
+            }
+        )
     
-    return JSONResponse(
+    # Con fields= se devuelven solo esos campos (y el id), sin construir los modelos
+    if campos:
+        lista_productos = [{"id": pid, **proyectar(data, campos)} for pid, data in pagina]
+    else:
+        lista_productos = [ProductoRespuesta(id=pid, **data) for pid, data in pagina]
+    
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
-            "productos": lista_productos
+            "productos": lista_productos,
+            "siguiente_cursor": siguiente_cursor
         }
     )
 
+# Exportación completa en NDJSON (un producto por línea), enviada por lotes con
+# memoria constante; el generador es async para recorrer el dict en el event loop
+@app.get("/productos/export")
+async def exportar_productos():
+    async def lineas():
+        for bloque in recorrer(productos):
+            yield b"".join(orjson.dumps({**data, "id": pid}) + b"\n" for pid, data in bloque)
+    
+    return StreamingResponse(
+        lineas(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="productos.ndjson"'}
+    )
+
 @app.get("/productos/{producto_id}")
 async def obtener_producto(producto_id: str):
     if producto_id not in productos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exitos": False,
@@ -90,18 +124,18 @@ async def obtener_producto(producto_id: str):
             }
         )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
-            "producto": ProductoRespuesta(id=producto_id, **productos[producto_id]).model_dump()
+            "producto": ProductoRespuesta(id=producto_id, **productos[producto_id])
         }
     )
 
 @app.put("/productos/{producto_id}")
 async def actualizar_producto(producto_id: str, producto_actualizar: ProductoActualizar):
     if producto_id not in productos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exitos": False,
@@ -114,19 +148,19 @@ async def actualizar_producto(producto_id: str, producto_actualizar: ProductoAct
     producto_existente.update(datos_actualizados)
     productos[producto_id] = producto_existente
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
             "mensaje": "Producto actualizado",
-            "producto": ProductoRespuesta(id=producto_id, **producto_existente).model_dump()
+            "producto": ProductoRespuesta(id=producto_id, **producto_existente)
         }
     )
 
 @app.delete("/productos/{producto_id}")
 async def eliminar_producto(producto_id: str):
     if producto_id not in productos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exito": False,
@@ -135,12 +169,12 @@ async def eliminar_producto(producto_id: str):
         )
     
     producto_eliminado = productos.pop(producto_id)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
             "mensaje": f"Producto con id {producto_id} eliminado exitosamente",
-            "producto": ProductoRespuesta(id=producto_id, **producto_eliminado).model_dump()
+            "producto": ProductoRespuesta(id=producto_id, **producto_eliminado)
         }
     )
 
@@ -0,0 +1,37 @@
+# Capa de respuestas JSON basada en orjson.
+#
+# ORJSONResponse sustituye a JSONResponse: codifica el contenido en una sola
+# pasada, sin jsonable_encoder ni json.dumps. Los modelos de Pydantic se pueden
+# devolver tal cual (sin .model_dump()), también dentro de dicts y listas: en
+# ese caso el contenido se codifica con el serializador de Pydantic (Rust), que
+# escribe los modelos directamente en JSON sin pasar por dicts intermedios.
+#
+# Nota: no conviene usarla como default_response_class en apps cuyas rutas
+# declaran response_model, porque FastAPI ya serializa esas respuestas a bytes
+# con Pydantic y un response_class personalizado desactiva ese camino rápido.
+
+from typing import Any
+import orjson
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse codificada con orjson (o con Pydantic si hay modelos)"""
+
+    def render(self, content: Any) -> bytes:
+        modelos = []
+
+        def serializar(obj: Any):
+            # orjson solo llama aquí con tipos que no conoce de forma nativa
+            if isinstance(obj, BaseModel):
+                modelos.append(obj)
+            raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+        try:
+            return orjson.dumps(content, default=serializar, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            if not modelos:
+                raise
+        # orjson se detiene en el primer modelo; Pydantic codifica todo el contenido de una vez
+        return pydantic_core.to_json(content)
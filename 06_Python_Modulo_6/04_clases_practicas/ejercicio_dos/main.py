@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+from secuencia import Secuencia
+from paginacion import ParametroInvalido, paginar, parsear_campos
 
 app = FastAPI()
 
@@ -10,7 +13,7 @@ class Cliente(BaseModel):
     edad: int
 
 clientes_db: List[Cliente] = []
-contador_id = 1
+ids_clientes = Secuencia()
 
 @app.get("/")
 def root():
@@ -18,15 +21,22 @@ def root():
 
 @app.post("/clientes", response_model=Cliente)
 def crear_cliente(cliente: Cliente):
-    global contador_id
-    cliente.id = contador_id
+    cliente.id = ids_clientes.siguiente()
     clientes_db.append(cliente)
-    contador_id += 1
     return cliente
 
 @app.get("/clientes", response_model=List[Cliente])
-def listar_clientes():
-    return clientes_db
+def listar_clientes(response: Response, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None):
+    try:
+        campos = parsear_campos(fields, Cliente.model_fields, obligatorios=("id",))
+        pagina, siguiente_cursor = paginar(clientes_db, limit, cursor, clave=lambda c: c.id)
+    except ParametroInvalido as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"X-Siguiente-Cursor": siguiente_cursor} if siguiente_cursor else {}
+    if campos:
+        return JSONResponse(content=[{c: getattr(cliente, c) for c in campos} for _, cliente in pagina], headers=headers)
+    response.headers.update(headers)
+    return [cliente for _, cliente in pagina]
 
 @app.get("/clientes/{cliente_id}", response_model=Cliente)
 def obtener_cliente(cliente_id: int):
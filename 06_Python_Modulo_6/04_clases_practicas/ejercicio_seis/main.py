@@ -1,7 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException, status
+from fastapi import FastAPI, APIRouter, HTTPException, Response, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
+from repositorio import Repositorio, ValorDuplicado
+from paginacion import ParametroInvalido, parsear_campos, proyectar
 
 # Modelos para las API los recursos
 class RecursoBase(BaseModel):
@@ -49,11 +51,23 @@ class UsuarioResponse(UsuarioBase):
     user_id: int = Field(..., gt=0, description="ID único del usuario")
 
 
-db_recursos: List[Dict] = []
-next_recurso_id = 1
-
-db_usuarios: List[Dict] = []
-next_usuario_id = 1
+# Almacenes en memoria indexados por ID (y por username/email en usuarios)
+db_recursos = Repositorio("item_id")
+db_usuarios = Repositorio("user_id", unicos=("username", "email"))
+
+def listar_pagina(repo: Repositorio, modelo, response: Response, limit: int, cursor: Optional[str], fields: Optional[str]):
+    """Página del repositorio; el cursor de la siguiente va en el header X-Siguiente-Cursor"""
+    try:
+        campos = parsear_campos(fields, modelo.model_fields, obligatorios=(repo.campo_id,))
+        pagina, siguiente_cursor = repo.paginar(limit, cursor)
+    except ParametroInvalido as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"X-Siguiente-Cursor": siguiente_cursor} if siguiente_cursor else {}
+    if campos:
+        # Una proyección no cumple el response_model completo: se devuelve tal cual
+        return JSONResponse(content=[proyectar(registro, campos) for registro in pagina], headers=headers)
+    response.headers.update(headers)
+    return pagina
 
 recurso_router = APIRouter(
     prefix="/recursos",
@@ -80,20 +94,15 @@ usuarios_router = APIRouter(
     summary="Crear un nuevo Recurso"
 )
 async def create_recurso(recurso: RecursoCreate):
-    global next_recurso_id
-    new_item = recurso.model_dump()
-    new_item["item_id"] = next_recurso_id
-    db_recursos.append(new_item)
-    next_recurso_id += 1
-    return new_item
+    return db_recursos.crear(recurso.model_dump())
 
 @recurso_router.get(
     "/",
     response_model=List[RecursoResponse],
     summary="Obtener todos los Recursos"
 )
-async def get_all_recursos():
-    return db_recursos
+async def get_all_recursos(response: Response, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return listar_pagina(db_recursos, RecursoResponse, response, limit, cursor, fields)
 
 @recurso_router.get(
     "/{item_id}",
@@ -103,10 +112,10 @@ async def get_all_recursos():
 async def read_recurso(item_id: int):
     if item_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Recuros inválido")
-    for item in db_recursos:
-        if item["item_id"] == item_id:
-            return item
-    raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    item = db_recursos.obtener(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    return item
 
 @recurso_router.put(
     "/{item_id}",
@@ -116,12 +125,10 @@ async def read_recurso(item_id: int):
 async def update_recurso(item_id: int, recurso: RecursoUpdate):
     if item_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Recuros inválido")
-    for item in db_recursos:
-        if item["item_id"] == item_id:
-            update_data = recurso.model_dump(exclude_unset=True)
-            item.update(update_data)
-            return item
-    raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    item = db_recursos.actualizar(item_id, recurso.model_dump(exclude_unset=True))
+    if item is None:
+        raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    return item
 
 @recurso_router.delete(
     "/{item_id}",
@@ -129,16 +136,13 @@ async def update_recurso(item_id: int, recurso: RecursoUpdate):
     summary="Eliminar un Recurso"
 )
 async def delete_recurso(item_id: int):
-    global db_recursos
     if item_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Recuros inválido")
-    for item in db_recursos:
-        if item["item_id"] == item_id:
-            db_recursos.remove(item)
-            return {
-                "mensaje": "Recurso eliminado con éxito"
-            }
-    raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    if db_recursos.eliminar(item_id) is None:
+        raise HTTPException(status_code=404, detail="Recurso no encontrado")
+    return {
+        "mensaje": "Recurso eliminado con éxito"
+    }
 
 # Endpoint de Usuarios (APIRest)
 
@@ -149,20 +153,18 @@ async def delete_recurso(item_id: int):
     summary="Crear un nuevo Usuario"
 )
 async def create_usuario(usuario: UsuarioCreate):
-    global next_usuario_id
-    new_user = usuario.model_dump()
-    new_user["user_id"] = next_usuario_id
-    db_usuarios.append(new_user)
-    next_usuario_id += 1
-    return new_user
+    try:
+        return db_usuarios.crear(usuario.model_dump())
+    except ValorDuplicado as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @usuarios_router.get(
     "/",
     response_model=List[UsuarioResponse],
     summary="Obtener todos los Usuarios"
 )
-async def get_all_usuarios():
-    return db_usuarios
+async def get_all_usuarios(response: Response, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return listar_pagina(db_usuarios, UsuarioResponse, response, limit, cursor, fields)
 
 @usuarios_router.get(
     "/{user_id}",
@@ -172,10 +174,10 @@ async def get_all_usuarios():
 async def read_usuario(user_id: int):
     if user_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Usuario inválido")
-    for user in db_usuarios:
-        if user["user_id"] == user_id:
-            return user
-    raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    user = db_usuarios.obtener(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return user
 
 @usuarios_router.put(
     "/{user_id}",
@@ -185,12 +187,13 @@ async def read_usuario(user_id: int):
 async def update_usuario(user_id: int, usuario: UsuarioUpdate):
     if user_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Usuario inválido")
-    for user in db_usuarios:
-        if user["user_id"] == user_id:
-            updata_data = usuario.model_dump(exclude_unset=True)
-            user.update(updata_data)
-            return user
-    raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    try:
+        user = db_usuarios.actualizar(user_id, usuario.model_dump(exclude_unset=True))
+    except ValorDuplicado as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if user is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return user
 
 @usuarios_router.delete(
     "/{user_id}",
@@ -198,16 +201,13 @@ async def update_usuario(user_id: int, usuario: UsuarioUpdate):
     summary="Eliminar un Usuario"
 )
 async def delete_usuario(user_id: int):
-    global db_usuarios
     if user_id <= 0:
         raise HTTPException(status_code=422, detail="ID de Usuario inválido")
-    for user in db_usuarios:
-        if user["user_id"] == user_id:
-            db_usuarios.remove(user)
-            return {
-                "mensaje": "Usuario eliminado con éxito"
-            }
-    raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    if db_usuarios.eliminar(user_id) is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return {
+        "mensaje": "Usuario eliminado con éxito"
+    }
 
 app = FastAPI(
     title="API de Recursos y Usuarios",
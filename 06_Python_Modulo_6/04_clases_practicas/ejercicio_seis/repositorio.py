@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional
+from secuencia import Secuencia
+from paginacion import paginar
+
+class ValorDuplicado(ValueError):
+    """Se intentó guardar un valor repetido en un campo único"""
+
+    def __init__(self, campo: str, valor):
+        super().__init__(f"Ya existe un registro con {campo} '{valor}'")
+        self.campo = campo
+        self.valor = valor
+
+class Repositorio:
+    """
+    Almacén en memoria indexado por clave primaria.
+
+    Los registros se guardan en un dict id -> registro, así que obtener,
+    actualizar y eliminar son O(1) en lugar de recorrer una lista. Los campos
+    únicos (p. ej. username o email) tienen su propio índice valor -> id.
+
+    crear asigna el ID e inserta sin ceder el control; como los handlers que lo
+    usan son async (un solo hilo), el orden de inserción es el de los IDs y
+    paginar puede reanudar por clave.
+    """
+
+    def __init__(self, campo_id: str, unicos: tuple = ()):
+        self.campo_id = campo_id
+        self._registros: Dict[int, dict] = {}
+        self._indices: Dict[str, Dict[object, int]] = {campo: {} for campo in unicos}
+        self._ids = Secuencia()
+
+    def _comprobar_unicos(self, datos: dict, registro_id: int = None):
+        for campo, indice in self._indices.items():
+            if campo in datos:
+                existente = indice.get(datos[campo])
+                if existente is not None and existente != registro_id:
+                    raise ValorDuplicado(campo, datos[campo])
+
+    def crear(self, datos: dict) -> dict:
+        """Guarda un registro nuevo con el siguiente ID y lo devuelve"""
+        self._comprobar_unicos(datos)
+        registro = dict(datos)
+        registro[self.campo_id] = registro_id = self._ids.siguiente()
+        self._registros[registro_id] = registro
+        for campo, indice in self._indices.items():
+            indice[registro[campo]] = registro_id
+        return registro
+
+    def obtener(self, registro_id: int) -> Optional[dict]:
+        return self._registros.get(registro_id)
+
+    def buscar_por(self, campo: str, valor) -> Optional[dict]:
+        """Busca por un campo único usando su índice"""
+        registro_id = self._indices[campo].get(valor)
+        return None if registro_id is None else self._registros[registro_id]
+
+    def listar(self) -> List[dict]:
+        """Todos los registros en orden de creación"""
+        return list(self._registros.values())
+
+    def paginar(self, limit: int, cursor: Optional[str] = None, filtro=None) -> tuple:
+        """(registros de la página, siguiente_cursor); ver paginacion.paginar"""
+        pagina, siguiente_cursor = paginar(self._registros, limit, cursor, filtro, claves_crecientes=True)
+        return [registro for _, registro in pagina], siguiente_cursor
+
+    def actualizar(self, registro_id: int, cambios: dict) -> Optional[dict]:
+        """Aplica los cambios y devuelve el registro, o None si no existe"""
+        registro = self._registros.get(registro_id)
+        if registro is None:
+            return None
+        self._comprobar_unicos(cambios, registro_id)
+        for campo, indice in self._indices.items():
+            if campo in cambios and cambios[campo] != registro[campo]:
+                del indice[registro[campo]]
+                indice[cambios[campo]] = registro_id
+        registro.update(cambios)
+        return registro
+
+    def eliminar(self, registro_id: int) -> Optional[dict]:
+        """Elimina el registro y lo devuelve, o None si no existe"""
+        registro = self._registros.pop(registro_id, None)
+        if registro is not None:
+            for campo, indice in self._indices.items():
+                indice.pop(registro[campo], None)
+        return registro
+
+    def __len__(self):
+        return len(self._registros)
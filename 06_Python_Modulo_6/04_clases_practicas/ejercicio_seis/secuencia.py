@@ -0,0 +1,28 @@
+# Generador de IDs para los almacenes en memoria.
+#
+# Los handlers síncronos (def) se ejecutan en el threadpool de Starlette, así
+# que varios hilos pueden crear registros a la vez. Un contador global
+# (leer, sumar y guardar) o len(coleccion) + 1 pueden entregar el mismo ID a dos
+# peticiones, y len + 1 además reutiliza IDs tras un borrado.
+#
+# Secuencia usa itertools.count: cada next() es una sola llamada en C que se
+# ejecuta de forma atómica bajo el GIL, sin tomar un lock por llamada. En un
+# intérprete sin GIL (free-threaded) se protege con un lock.
+
+import itertools
+import sys
+import threading
+
+class Secuencia:
+    """Secuencia de IDs enteros únicos y crecientes, segura entre hilos"""
+
+    def __init__(self, inicio: int = 1):
+        self._contador = itertools.count(inicio)
+        gil_activo = getattr(sys, "_is_gil_enabled", lambda: True)()
+        self._lock = None if gil_activo else threading.Lock()
+
+    def siguiente(self) -> int:
+        if self._lock is None:
+            return next(self._contador)
+        with self._lock:
+            return next(self._contador)
@@ -0,0 +1,43 @@
+# migraciones.py
+#
+# Migraciones del esquema con Alembic.
+#
+# El esquema se crea y actualiza con un comando explícito, una vez por
+# despliegue, en lugar de crear las tablas con create_all().
+# Desde la carpeta de la app:
+#
+#   python -m migraciones          # aplica las migraciones pendientes
+#   python -m migraciones stamp    # marca como actualizada una base creada con create_all()
+#   python -m migraciones actual   # muestra la revisión de la base
+
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _config(configurar_logging: bool = True) -> Config:
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    config.attributes["configurar_logging"] = configurar_logging
+    return config
+
+def migrar(configurar_logging: bool = False):
+    """Aplica todas las migraciones pendientes (upgrade head)"""
+    command.upgrade(_config(configurar_logging), "head")
+
+def main():
+    orden = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if orden == "upgrade":
+        migrar(configurar_logging=True)
+    elif orden == "stamp":
+        command.stamp(_config(), "head")
+    elif orden == "actual":
+        command.current(_config(), verbose=True)
+    else:
+        print("Uso: python -m migraciones [upgrade|stamp|actual]")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
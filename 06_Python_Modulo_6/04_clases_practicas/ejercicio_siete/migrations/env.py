@@ -0,0 +1,41 @@
+# Entorno de Alembic para el engine de la aplicación
+
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+
+# Permite ejecutar también "alembic ..." desde la carpeta de la app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import engine
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configurar_logging", True):
+    fileConfig(config.config_file_name)
+
+# Los modelos ORM están en main.py junto con las rutas; las migraciones se
+# escriben a mano, así que no se usa --autogenerate
+target_metadata = None
+
+def run_migrations_offline():
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
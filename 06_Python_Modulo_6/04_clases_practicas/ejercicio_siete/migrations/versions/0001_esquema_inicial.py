@@ -0,0 +1,36 @@
+"""Esquema inicial: proyectos y clientes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "proyectos",
+        sa.Column("proyecto_id", sa.String(36), primary_key=True),
+        sa.Column("nombre", sa.String(100), nullable=False),
+        sa.Column("descripcion", sa.Text(), nullable=False),
+        sa.Column("presupuesto", sa.Float(), nullable=False),
+        sa.Column("fecha_inicio", sa.Date(), nullable=False),
+    )
+    op.create_table(
+        "clientes",
+        sa.Column("cliente_id", sa.String(36), primary_key=True),
+        sa.Column("nombre", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("telefono", sa.String(20), nullable=False),
+        sa.Column("empresa", sa.String(100), nullable=False),
+        sa.Column("direccion", sa.String(200), nullable=False),
+    )
+
+def downgrade():
+    op.drop_table("clientes")
+    op.drop_table("proyectos")
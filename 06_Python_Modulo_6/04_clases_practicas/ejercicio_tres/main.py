@@ -1,11 +1,14 @@
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from respuestas import ORJSONResponse
+from secuencia import Secuencia
+from paginacion import ParametroInvalido, paginar, parsear_campos, proyectar, rango
 from pydantic import BaseModel
 from typing import Dict, List
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 articulos: Dict[int, dict]  = {}
+ids_articulos = Secuencia()
 
 class ArticuloBase(BaseModel):
     nombre: str
@@ -27,7 +30,7 @@ class ArticuloRespuesta(ArticuloBase):
 
 @app.get("/")
 def raiz():
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={"exito": True, 
                  "mensaje": "Bienvenido a la API de articulos"
@@ -35,9 +38,11 @@ def raiz():
         )
 
 @app.get("/articulos", response_model=List[ArticuloRespuesta])
-def obtener_todos_articulos():
+def obtener_todos_articulos(limit: int = 100, cursor: str | None = None,
+                             precio_min: float | None = None, precio_max: float | None = None,
+                             fields: str | None = None):
     if not articulos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={"exito": False, 
                      "mensaje": "No se encontraron articulos", 
@@ -45,47 +50,62 @@ def obtener_todos_articulos():
                      }
             )
     
-    lista_articulos = [ArticuloRespuesta(id=articulo_id, **datos).model_dump() for articulo_id, datos in articulos.items()]
+    try:
+        campos = parsear_campos(fields, ArticuloBase.model_fields)
+        pagina, siguiente_cursor = paginar(articulos, limit, cursor, rango("precio", precio_min, precio_max))
+    except ParametroInvalido as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"exito": False, 
+                     "mensaje": str(e)
+                     }
+            )
+    
+    if campos:
+        lista_articulos = [{"id": articulo_id, **proyectar(datos, campos)} for articulo_id, datos in pagina]
+    else:
+        lista_articulos = [ArticuloRespuesta(id=articulo_id, **datos) for articulo_id, datos in pagina]
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={"exito": True, 
-                 "articulos": lista_articulos
+                 "articulos": lista_articulos,
+                 "siguiente_cursor": siguiente_cursor
                  }
         )
 
 @app.get("/articulos/{articulo_id}", response_model=ArticuloRespuesta)
 def obtener_articulo(articulo_id: int):
     if articulo_id not in articulos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={"exito": False, 
                      "mensaje": "Articulo no encontrado"
                      }
             )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={"exitos": True, 
-                 "articulo": ArticuloRespuesta(id=articulo_id, **articulos[articulo_id]).model_dump()}
+                 "articulo": ArticuloRespuesta(id=articulo_id, **articulos[articulo_id])}
         )
 
 @app.post("/articulos/", response_model=ArticuloRespuesta)
 def crear_articulo(articulo: ArticuloCrear):
-    articulo_id = len(articulos) + 1
+    articulo_id = ids_articulos.siguiente()
     articulos[articulo_id] = articulo.model_dump()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=201,
         content={
             "exito": True,
             "mensaje": "Articulo creado",
-            "articulo": ArticuloRespuesta(id=articulo_id, **articulos[articulo_id]).model_dump()}
+            "articulo": ArticuloRespuesta(id=articulo_id, **articulos[articulo_id])}
         )
 
 @app.put("/articulos/{articulo_id}", response_model=ArticuloRespuesta)
 def actualizar_articulo(articulo_id: int, articulo: ArticuloActualizar):
     if articulo_id not in articulos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "exitos": False,
@@ -98,31 +118,31 @@ def actualizar_articulo(articulo_id: int, articulo: ArticuloActualizar):
     articulo_guardado.update(datos_actualizados)
     articulos[articulo_id] = articulo_guardado
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
             "mensaje": "Articulo actualizado",
-            "articulo": ArticuloRespuesta(id=articulo_id, **articulo_guardado).model_dump()
+            "articulo": ArticuloRespuesta(id=articulo_id, **articulo_guardado)
             }
         )
 
 @app.delete("/articulos/{articulo_id}", response_model=ArticuloRespuesta)
 def eliminar_articulo(articulo_id: int):
     if articulo_id not in articulos:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={"exito": False,
                      "mensaje": "Articulo no encontrado"}
             )
     
     articulo_eliminado = articulos.pop(articulo_id)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "exito": True,
             "mensaje": f"El articulo con ID {articulo_id} fue eliminado exitosamente",
-            "articulo": ArticuloRespuesta(id=articulo_id, **articulo_eliminado). model_dump()
+            "articulo": ArticuloRespuesta(id=articulo_id, **articulo_eliminado)
         }
     )
     
\ No newline at end of file
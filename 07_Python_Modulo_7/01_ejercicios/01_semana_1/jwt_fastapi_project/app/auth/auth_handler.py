@@ -9,8 +9,16 @@ load_dotenv()
 
 # Configuración JWT desde variables de entorno
 SECRET_KEY = os.getenv("SECRET_KEY")
+# Procesos que atienden la app (lo fija python -m core.servidor; 1 en desarrollo)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+if not SECRET_KEY and WEB_CONCURRENCY > 1:
+    # Cada worker generaría su propia clave y rechazaría los tokens firmados por los demás
+    raise RuntimeError(
+        "SECRET_KEY no está configurada y la app se ejecuta con varios workers. "
+        "Agrega SECRET_KEY a tu archivo .env"
+    )
 if not SECRET_KEY:
-    # Generar SECRET_KEY automáticamente con secrets si no existe
+    # Generar SECRET_KEY automáticamente con secrets si no existe (solo con un worker)
     SECRET_KEY = secrets.token_urlsafe(32)
     print(f"⚠️  ADVERTENCIA: SECRET_KEY no encontrada en .env")
     print(f"🔑 Usando clave temporal generada: {SECRET_KEY}")
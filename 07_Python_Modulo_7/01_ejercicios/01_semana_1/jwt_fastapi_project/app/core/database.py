@@ -3,6 +3,7 @@ from sqlalchemy.ext.declarative import declarative_base  # Permite definir clase
 from sqlalchemy.orm import sessionmaker  # Permite crear sesiones para interactuar con la base de datos
 from sqlalchemy.exc import SQLAlchemyError  # Para capturar errores específicos de SQLAlchemy
 import os  # Permite acceder a variables del sistema
+import logging  # Para registrar la configuración efectiva del pool
 from dotenv import load_dotenv  # Permite cargar variables desde un archivo .env al entorno del sistema
 
 # Cargar las variables de entorno definidas en un archivo .env (si existe)
@@ -17,8 +18,31 @@ DB_NAME = os.getenv("DB_NAME", "db_ejemplo")  # Nombre de la base de datos
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+logger = logging.getLogger(__name__)
+
+# Configuración del pool de conexiones (dimensionar según el número de workers:
+# conexiones máximas por worker = DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # Conexiones que se mantienen abiertas
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Conexiones extra permitidas en picos
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Segundos de espera por una conexión libre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Segundos antes de reciclar una conexión
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")  # Verifica la conexión antes de usarla
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # Tiempo máximo por sentencia (0 = sin límite)
+
+connect_args = {}
+if DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"  # Parámetro de sesión de PostgreSQL
+
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -36,3 +60,22 @@ def get_db():
         raise Exception(f"Error en la operación de base de datos: {str(e)}")  # Se lanza una excepción personalizada
     finally:
         db.close()  # Siempre se cierra la sesión, haya error o no, para liberar recursos
+
+def log_pool_config():
+    """Registra los parámetros efectivos del pool de conexiones"""
+    logger.info(
+        f"Pool de conexiones: pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}, "
+        f"pool_timeout={DB_POOL_TIMEOUT}s, pool_recycle={DB_POOL_RECYCLE}s, "
+        f"pre_ping={DB_POOL_PRE_PING}, statement_timeout={DB_STATEMENT_TIMEOUT_MS}ms"
+    )
+
+def estado_pool() -> dict:
+    """Devuelve el estado actual del pool (conexiones en uso y libres)"""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),  # Conexiones prestadas a sesiones activas
+        "idle": pool.checkedin(),  # Conexiones abiertas disponibles
+        "overflow": max(pool.overflow(), 0),  # Conexiones extra por encima de pool_size
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
@@ -0,0 +1,111 @@
+# core/servidor.py
+#
+# Lanzador de producción (desde la carpeta de la app): python -m core.servidor
+#
+# Con gunicorn (Linux/macOS) arranca un proceso maestro que importa la app una
+# sola vez (preload) y hace fork de N workers uvicorn con uvloop + httptools.
+# Cada worker se recicla tras SERVER_MAX_REQUESTS peticiones (más un margen
+# aleatorio para que no se reinicien todos a la vez) y el maestro lo reemplaza
+# sin cortar las conexiones en curso. Sin gunicorn (p. ej. en Windows) se usa
+# el supervisor multiproceso de uvicorn, que no admite preload.
+
+import os
+
+try:
+    from gunicorn.app.base import BaseApplication
+    try:
+        from uvicorn_worker import UvicornWorker  # Paquete actual del worker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker  # Versión incluida en uvicorn (obsoleta)
+except ImportError:
+    BaseApplication = None
+
+def _cpus() -> int:
+    """CPUs disponibles para el proceso (respeta los límites de afinidad del contenedor)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def configuracion() -> dict:
+    """Parámetros del servidor desde variables de entorno"""
+    return {
+        "host": os.getenv("SERVER_HOST", "0.0.0.0"),
+        "port": int(os.getenv("SERVER_PORT", "8000")),
+        # Un worker por CPU: el trabajo pesado (Argon2) ya es CPU y cada worker es asíncrono
+        "workers": int(os.getenv("SERVER_WORKERS", os.getenv("WEB_CONCURRENCY", str(_cpus())))),
+        "max_requests": int(os.getenv("SERVER_MAX_REQUESTS", "10000")),  # 0 desactiva el reciclado
+        "max_requests_jitter": int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000")),
+        "keepalive": int(os.getenv("SERVER_KEEPALIVE", "5")),  # Segundos que se mantiene abierta una conexión inactiva
+        "backlog": int(os.getenv("SERVER_BACKLOG", "2048")),  # Conexiones pendientes de aceptar
+        "timeout": int(os.getenv("SERVER_TIMEOUT", "30")),  # Un worker que no responde en este tiempo se reinicia
+        "graceful_timeout": int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30")),  # Margen para terminar peticiones al reciclar
+        "preload": os.getenv("SERVER_PRELOAD", "true").lower() in ("1", "true", "yes"),
+    }
+
+if BaseApplication is not None:
+
+    class UvicornWorkerProduccion(UvicornWorker):
+        """Worker uvicorn con uvloop y httptools fijos (falla si no están instalados)"""
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+    class _Gunicorn(BaseApplication):
+        """Aplicación gunicorn configurada desde código en lugar de un gunicorn.conf.py"""
+
+        def __init__(self, app_path: str, opciones: dict):
+            self.app_path = app_path
+            self.opciones = opciones
+            super().__init__()
+
+        def load_config(self):
+            for clave, valor in self.opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            from gunicorn.util import import_app
+            return import_app(self.app_path)
+
+def serve(app_path: str = "main:app"):
+    """Arranca la app con el perfil de producción"""
+    config = configuracion()
+    print(f"🚀 Servidor de producción en {config['host']}:{config['port']} con {config['workers']} workers")
+    # La app puede consultar cuántos procesos la atienden (p. ej. para rechazar estado por proceso)
+    os.environ["WEB_CONCURRENCY"] = str(config["workers"])
+
+    if BaseApplication is not None:
+        _Gunicorn(app_path, {
+            "bind": f"{config['host']}:{config['port']}",
+            "workers": config["workers"],
+            "worker_class": UvicornWorkerProduccion,
+            "preload_app": config["preload"],
+            "max_requests": config["max_requests"],
+            "max_requests_jitter": config["max_requests_jitter"],
+            "keepalive": config["keepalive"],
+            "backlog": config["backlog"],
+            "timeout": config["timeout"],
+            "graceful_timeout": config["graceful_timeout"],
+        }).run()
+        return
+
+    import uvicorn
+    if config["workers"] > 1:
+        # Sin preload cada worker importa la app por su cuenta: se importa antes aquí
+        # para que un error de configuración detenga el arranque en lugar de cada worker
+        from uvicorn.importer import import_from_string
+        import_from_string(app_path)
+    uvicorn.run(
+        app_path,
+        host=config["host"],
+        port=config["port"],
+        workers=config["workers"],
+        loop="auto",  # uvloop y httptools si están instalados (uvicorn[standard], salvo en Windows)
+        http="auto",
+        limit_max_requests=config["max_requests"] or None,
+        timeout_keep_alive=config["keepalive"],
+        backlog=config["backlog"],
+        timeout_graceful_shutdown=config["graceful_timeout"],
+        log_level="info",
+    )
+
+if __name__ == "__main__":
+    serve()
@@ -7,8 +7,11 @@ from fastapi.responses import JSONResponse
 # Importamos middleware de CORS para permitir peticiones desde otros dominios
 from fastapi.middleware.cors import CORSMiddleware
 
-# Importamos la base declarativa y el motor de la base de datos
-from core.database import Base, engine
+# Importamos el motor de la base de datos
+from core.database import engine, log_pool_config, estado_pool
+
+# Importamos la verificación de la revisión de esquema (las tablas se crean con migraciones)
+from core.migraciones import verificar_esquema
 
 # Importamos las rutas de usuario con un alias
 from routes.user_routes import router as user_router
@@ -34,8 +37,12 @@ async def lifespan(app: FastAPI):
     """Gestiona el inicio y cierre de la aplicación"""
     # Código que se ejecuta al iniciar
     try:
-        Base.metadata.create_all(bind=engine)  # Ejecuta la creación de todas las tablas definidas en los modelos
-        logger.info("Base de datos inicializada correctamente")  # Mensaje de éxito
+        # El esquema lo crean las migraciones (python -m core.migraciones); aquí
+        # solo se comprueba que la base esté en la revisión que espera el código
+        with engine.connect() as conn:
+            revision = verificar_esquema(conn)
+        logger.info(f"Base de datos en la revisión de esquema {revision}")  # Mensaje de éxito
+        log_pool_config()  # Deja constancia de la configuración efectiva del pool
     except Exception as e:
         logger.error(f"Error al inicializar la base de datos: {str(e)}")  # Mensaje de error
         raise  # Lanza nuevamente la excepción para detener la aplicación si hay fallo
@@ -74,6 +81,12 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "Error interno del servidor"}
     )
 
+# ------------------------------------------------------------
+# Endpoint de salud del pool de conexiones a la base de datos
+@app.get("/health/db", tags=["Salud"], summary="Estado del pool de conexiones")
+def health_db():
+    return estado_pool()
+
 # ------------------------------------------------------------
 # Incluir el conjunto de rutas definidas en el archivo user_routes
 app.include_router(user_router, prefix="/api/v1")  # Todas las rutas estarán bajo /api/v1 (ej: /api/v1/login)
@@ -81,7 +94,7 @@ app.include_router(user_router, prefix="/api/v1")  # Todas las rutas estarán ba
 # ------------------------------------------------------------
 # Punto de entrada principal de la aplicación
 def main():
-    """Función principal para iniciar el servidor"""
+    """Función principal para iniciar el servidor de desarrollo (producción: python -m core.servidor)"""
     import uvicorn
     import webbrowser
     from threading import Timer
@@ -0,0 +1,28 @@
+"""Esquema inicial: users
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, comment="ID único del usuario"),
+        sa.Column("username", sa.String(50), nullable=False, comment="Nombre de usuario único"),
+        sa.Column("hashed_password", sa.String(255), nullable=False, comment="Contraseña hasheada del usuario"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), comment="Fecha y hora de creación del usuario"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), comment="Fecha y hora de última actualización"),
+    )
+    op.create_index(op.f("ix_users_id"), "users", ["id"])
+    op.create_index(op.f("ix_users_username"), "users", ["username"], unique=True)
+
+def downgrade():
+    op.drop_table("users")
@@ -1,23 +1,31 @@
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
+import hashlib
 import os
-import secrets
+import time
 from dotenv import load_dotenv
+from core.cache import TTLCache
+from core.metrics import medir_jwt
+from auth.keyring import cargar_keyring
 
 # Cargar variables de entorno
 load_dotenv()
 
 # Configuración JWT desde variables de entorno
-SECRET_KEY = os.getenv("SECRET_KEY")
-if not SECRET_KEY:
-    # Generar SECRET_KEY automáticamente con secrets si no existe
-    SECRET_KEY = secrets.token_urlsafe(32)
-    print(f"⚠️  ADVERTENCIA: SECRET_KEY no encontrada en .env")
-    print(f"🔑 Usando clave temporal generada: {SECRET_KEY}")
-    print(f"💡 Para producción, agrega esta clave a tu archivo .env")
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "keys")  # Directorio con las claves privadas <kid>.pem
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID")  # kid que firma los tokens nuevos (por defecto el último)
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))  # Vida corta: se renueva con el refresh token
 
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Procesos que atienden la app (lo fija python -m core.servidor; 1 en desarrollo)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Las claves se cargan y parsean una sola vez al importar el módulo. Una clave
+# temporal solo sirve con un único worker: con varios cada uno generaría la suya
+keyring = cargar_keyring(JWT_KEYS_DIR, JWT_ACTIVE_KID, permitir_temporal=WEB_CONCURRENCY <= 1)
+
+# Caché de tokens ya verificados: digest del token -> claims decodificados
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+token_cache = TTLCache(maxsize=TOKEN_CACHE_MAXSIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 def crear_token(data: dict, expiracion: int = ACCESS_TOKEN_EXPIRE_MINUTES):
     to_encode = data.copy()
@@ -26,11 +34,40 @@ def crear_token(data: dict, expiracion: int = ACCESS_TOKEN_EXPIRE_MINUTES):
     
     to_encode.update({"exp": expire})
     
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    kid = keyring.kid_activo
+    with medir_jwt("encode"):
+        return jwt.encode(to_encode, keyring.privadas[kid], algorithm=keyring.algoritmos[kid], headers={"kid": kid})
+
+def _clave_cache(token: str) -> bytes:
+    # Usamos el digest como clave para no guardar el token completo en memoria
+    return hashlib.sha256(token.encode()).digest()
+
+def olvidar_token(token: str):
+    """Descarta de la caché la verificación de un token concreto"""
+    token_cache.invalidar(_clave_cache(token))
 
 def verificar_token(token: str):
+    clave = _clave_cache(token)
+    payload = token_cache.get(clave)
+    if payload is not None:
+        return dict(payload)  # Copia para que el llamador no altere la entrada cacheada
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        # El header indica con qué clave se firmó; solo se aceptan kids del llavero
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid not in keyring.publicas:
+            return None
+        with medir_jwt("decode"):
+            payload = jwt.decode(token, keyring.publicas[kid], algorithms=[keyring.algoritmos[kid]])
     except JWTError:
         return None
+
+    # La entrada expira junto con el token (claim "exp"), nunca después
+    restante = payload.get("exp", 0) - time.time()
+    if restante > 0:
+        token_cache.set(clave, dict(payload), ttl=min(restante, token_cache.ttl))
+    return payload
+
+def obtener_jwks() -> dict:
+    """Claves públicas para que otros servicios verifiquen los tokens"""
+    return keyring.jwks()
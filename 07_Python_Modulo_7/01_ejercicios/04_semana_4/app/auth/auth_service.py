@@ -1,12 +1,138 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from passlib.context import CryptContext
+from core.metrics import registrar_hash
 
 # Contexto de encriptación y base de datos de usuarios
 HASH_SCHEME = "argon2"
 
 pwd_context = CryptContext(schemes=[HASH_SCHEME], deprecated="auto")
 
+# Configuración del pool de hashing desde variables de entorno
+# argon2-cffi libera el GIL, por lo que un pool de hilos aprovecha varios núcleos
+HASH_MAX_WORKERS = int(os.getenv("HASH_MAX_WORKERS", str(os.cpu_count() or 1)))
+HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", "64"))  # Peticiones que pueden esperar un hilo libre
+
+# Se crea al primer uso y se descarta al cerrar, así cada lifespan (reinicios,
+# tests con varios TestClient) trabaja con un pool propio
+_executor = None
+_lock = Lock()
+_en_curso = 0  # Tareas encoladas o ejecutándose en el pool
+
+def _pool() -> ThreadPoolExecutor:
+    """Devuelve el pool de hashing, creándolo si aún no existe o ya se cerró"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HASH_MAX_WORKERS, thread_name_prefix="argon2")
+        return _executor
+
+class HashPoolSaturado(Exception):
+    """Se lanza cuando la cola del pool de hashing está llena"""
+
+class HashMetrics:
+    """Acumula tiempos de espera en cola y de cálculo del hash"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.operaciones = 0
+        self.rechazadas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.hash_total = 0.0
+        self.hash_max = 0.0
+
+    def registrar(self, espera: float, duracion: float):
+        with self._lock:
+            self.operaciones += 1
+            self.espera_total += espera
+            self.espera_max = max(self.espera_max, espera)
+            self.hash_total += duracion
+            self.hash_max = max(self.hash_max, duracion)
+
+    def rechazar(self):
+        with self._lock:
+            self.rechazadas += 1
+
+    def snapshot(self) -> dict:
+        """Devuelve una copia de las métricas actuales (tiempos en segundos)"""
+        with self._lock:
+            n = self.operaciones or 1
+            return {
+                "operaciones": self.operaciones,
+                "rechazadas": self.rechazadas,
+                "en_curso": _en_curso,
+                "espera_promedio": self.espera_total / n,
+                "espera_max": self.espera_max,
+                "hash_promedio": self.hash_total / n,
+                "hash_max": self.hash_max,
+            }
+
+metricas = HashMetrics()
+
 def hashear_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verificar_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+async def _ejecutar_en_pool(operacion: str, func, *args):
+    """Ejecuta func en el pool de hashing sin bloquear el event loop"""
+    global _en_curso
+    with _lock:
+        if _en_curso >= HASH_MAX_WORKERS + HASH_MAX_QUEUE:
+            metricas.rechazar()
+            raise HashPoolSaturado("Demasiadas operaciones de hashing en espera")
+        _en_curso += 1
+
+    encolado = time.perf_counter()
+
+    def tarea():
+        inicio = time.perf_counter()
+        resultado = func(*args)
+        return resultado, inicio, time.perf_counter()
+
+    try:
+        resultado, inicio, fin = await asyncio.get_running_loop().run_in_executor(_pool(), tarea)
+    finally:
+        with _lock:
+            _en_curso -= 1
+
+    # Se registra en el event loop para asociar el tiempo a la petición en curso
+    metricas.registrar(inicio - encolado, fin - inicio)
+    registrar_hash(operacion, inicio - encolado, fin - inicio)
+    return resultado
+
+async def hash_async(password: str) -> str:
+    return await _ejecutar_en_pool("hash", hashear_password, password)
+
+async def verify_async(plain_password: str, hashed_password: str) -> bool:
+    return await _ejecutar_en_pool("verify", verificar_password, plain_password, hashed_password)
+
+async def hash_many_async(passwords: list) -> list:
+    """
+    Hashea varias contraseñas en paralelo sin superar HASH_MAX_WORKERS
+    tareas simultáneas, para que un lote grande no llene la cola del pool.
+    """
+    limite = asyncio.Semaphore(HASH_MAX_WORKERS)
+
+    async def hashear_uno(password: str) -> str:
+        async with limite:
+            return await hash_async(password)
+
+    return await asyncio.gather(*(hashear_uno(p) for p in passwords))
+
+async def cerrar_pool_hashing():
+    """
+    Libera los hilos del pool (se llama al cerrar la aplicación). La espera a
+    que terminen los hashes en curso se hace en otro hilo para no bloquear el
+    event loop; el siguiente uso crea un pool nuevo.
+    """
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown, wait=True)
@@ -1,62 +1,227 @@
 # app/auth/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+import os
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy import select
+from core.database import SessionLocal
 from models.user_model import User
 from auth.auth_handler import verificar_token
+from auth.principal import Principal, PRINCIPAL_COLUMNS
+from auth.user_cache import user_cache, token_versions
+from core.rate_limit import RateLimiter, parsear_limite
 
 # Esquema de seguridad HTTP Bearer (para tokens JWT)
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+# Límites de las rutas que calculan hashes Argon2, en formato "peticiones/segundos"
+RATE_LIMIT_LOGIN_IP = parsear_limite(os.getenv("RATE_LIMIT_LOGIN_IP", "20/60"))
+RATE_LIMIT_LOGIN_USER = parsear_limite(os.getenv("RATE_LIMIT_LOGIN_USER", "5/60"))
+RATE_LIMIT_REGISTER_IP = parsear_limite(os.getenv("RATE_LIMIT_REGISTER_IP", "10/60"))
+# Registro masivo: cada usuario del lote consume un token; un lote mayor que la capacidad se rechaza (413)
+RATE_LIMIT_REGISTER_BULK_IP = parsear_limite(os.getenv("RATE_LIMIT_REGISTER_BULK_IP", "1000/3600"))
+
+rate_limiter = RateLimiter()
+
+def _decodificar_credenciales(credentials: HTTPAuthorizationCredentials) -> dict:
     """
-    Dependency para obtener el usuario actual autenticado desde el token JWT.
-    
-    Args:
-        credentials: Credenciales HTTP Bearer (token JWT)
-        db: Sesión de base de datos
-        
-    Returns:
-        User: Usuario autenticado
-        
+    Verifica el token JWT y devuelve sus claims.
+
     Raises:
-        HTTPException: Si el token es inválido o el usuario no existe
+        HTTPException: Si el token es inválido, expiró o no tiene "sub"
     """
     # Extraer el token del header Authorization
     token = credentials.credentials
-    
+
     # Verificar y decodificar el token
     payload = verificar_token(token)
-    
+
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido o expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Obtener el username del payload
-    username: str = payload.get("sub")
-    if not username:
+
+    # Comprobar que el payload incluye el username
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido: falta información del usuario",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Buscar el usuario en la base de datos
-    user = db.query(User).filter(User.username == username).first()
-    
-    if not user:
+
+    return payload
+
+async def _cargar_principal(username: str) -> Principal:
+    """
+    Obtiene el Principal del usuario desde la caché o, si no está, desde la base de datos.
+
+    Raises:
+        HTTPException: Si el usuario no existe
+    """
+    # Si el usuario está en caché no se abre ninguna sesión de base de datos
+    principal = user_cache.get(username)
+    if principal is not None:
+        return principal
+
+    # Buscar solo las columnas necesarias, sin cargar el modelo ORM
+    async with SessionLocal() as db:
+        result = await db.execute(select(*PRINCIPAL_COLUMNS).where(User.username == username))
+        fila = result.one_or_none()
+
+    if not fila:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user
+
+    principal = Principal(*fila)
+    user_cache.set(username, principal)
+    return principal
+
+async def _permisos_actuales(username: str):
+    """(token_version, role, is_active) actuales del usuario, o None si no existe"""
+    permisos = token_versions.get(username)
+    if permisos is not None:
+        return permisos
+
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(User.token_version, User.role, User.is_active).where(User.username == username)
+        )
+        fila = result.one_or_none()
+
+    if fila is None:
+        return None
+    permisos = tuple(fila)
+    token_versions.set(username, permisos)
+    return permisos
+
+async def _verificar_version(payload: dict) -> tuple:
+    """
+    Comprueba que el token no quedó obsoleto y devuelve los permisos actuales.
+
+    La versión actual se lee de la base de datos (compartida por todos los
+    workers) y se reutiliza durante TOKEN_VERSION_TTL segundos. Un cambio de
+    rol, de contraseña o la desactivación del usuario incrementan la versión,
+    así que los tokens emitidos antes dejan de valer aunque no hayan expirado.
+
+    Raises:
+        HTTPException: Si el usuario no existe, está inactivo o el token es de una versión anterior (401)
+    """
+    permisos = await _permisos_actuales(payload["sub"])
+    if permisos is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    version_actual, _, activo = permisos
+    version = payload.get("ver")
+    if not isinstance(version, int) or version < version_actual:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado: vuelva a iniciar sesión",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not activo:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario inactivo",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return permisos
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """
+    Dependency para obtener el usuario actual autenticado desde el token JWT.
+
+    Args:
+        credentials: Credenciales HTTP Bearer (token JWT)
+
+    Returns:
+        Principal: Usuario autenticado (inmutable, sin sesión de base de datos)
+
+    Raises:
+        HTTPException: Si el token es inválido u obsoleto, o el usuario no existe
+    """
+    payload = _decodificar_credenciales(credentials)
+    await _verificar_version(payload)
+    return await _cargar_principal(payload["sub"])
+
+def require_role(*roles: str, detail: str = "No tiene permisos para acceder a esta ruta"):
+    """
+    Crea una dependency que autoriza según el claim "role" del token.
+
+    Un token de una versión anterior a la actual del usuario se rechaza con
+    401 (ver _verificar_version); si la versión está al día, su rol es el
+    vigente. Un token sin "role" se autoriza con el rol actual del usuario.
+
+    Args:
+        roles: Roles que pueden acceder a la ruta
+        detail: Mensaje del error 403
+
+    Returns:
+        Dependency que devuelve los claims del token
+    """
+    async def verificar_rol(
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+    ) -> dict:
+        payload = _decodificar_credenciales(credentials)
+        _, rol_actual, _ = await _verificar_version(payload)
+        rol = payload.get("role") or rol_actual
+
+        if rol not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+        return payload
+
+    return verificar_rol
+
+def _ip_cliente(request: Request) -> str:
+    """IP del cliente (detrás de un proxy, uvicorn debe ejecutarse con --proxy-headers)"""
+    return request.client.host if request.client else "desconocida"
+
+async def limitar_login(request: Request):
+    """
+    Dependency que limita los intentos de login por IP.
+
+    Se ejecuta antes del endpoint, así que un intento rechazado no llega a
+    verificar la contraseña (no consume CPU de Argon2).
+
+    Raises:
+        RateLimitExcedido: Si se agotó el límite (429)
+    """
+    await rate_limiter.comprobar("login:ip", _ip_cliente(request), RATE_LIMIT_LOGIN_IP)
+
+async def limitar_login_usuario(username: str):
+    """
+    Limita los intentos de login por usuario.
+
+    La llama el endpoint con el cuerpo ya validado, antes de verificar la contraseña.
+
+    Raises:
+        RateLimitExcedido: Si se agotó el límite (429)
+    """
+    # Mismo criterio que el modelo User: el username se guarda en minúsculas
+    await rate_limiter.comprobar("login:user", username.lower().strip(), RATE_LIMIT_LOGIN_USER)
+
+async def limitar_registro(request: Request):
+    """Dependency que limita los registros por IP (cada uno calcula un hash)"""
+    await rate_limiter.comprobar("register:ip", _ip_cliente(request), RATE_LIMIT_REGISTER_IP)
+
+async def limitar_registro_bulk(request: Request, cantidad: int):
+    """
+    Limita el registro masivo por IP: cada usuario del lote consume un token.
+
+    La llama el endpoint con el cuerpo ya validado, antes de calcular ningún hash.
+
+    Raises:
+        RateLimitExcedido: Si no quedan tokens para todo el lote (429)
+        CosteExcedeCapacidad: Si el lote supera la capacidad del límite (413)
+    """
+    await rate_limiter.comprobar("register_bulk:ip", _ip_cliente(request), RATE_LIMIT_REGISTER_BULK_IP, coste=cantidad)
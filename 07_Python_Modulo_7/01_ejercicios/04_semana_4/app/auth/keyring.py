@@ -0,0 +1,110 @@
+# app/auth/keyring.py
+#
+# Llavero de claves asimétricas para firmar y verificar JWT.
+#
+# Cada archivo <kid>.pem del directorio JWT_KEYS_DIR es una clave privada
+# (RSA -> RS256, EC P-256 -> ES256). La clave JWT_ACTIVE_KID firma los tokens
+# nuevos; el resto solo verifica, lo que permite rotar claves sin invalidar
+# los tokens ya emitidos. Generar una clave nueva:
+#
+#   python -m auth.keyring generar <kid>
+
+import os
+import secrets
+import sys
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.constants import ALGORITHMS
+
+class KeyRing:
+    """Claves de firma por kid, construidas (parseadas) una sola vez"""
+
+    def __init__(self):
+        self.algoritmos = {}  # kid -> algoritmo JWS
+        self.privadas = {}  # kid -> clave jose lista para firmar
+        self.publicas = {}  # kid -> clave jose lista para verificar
+        self.kid_activo = None
+
+    def agregar(self, kid: str, pem: bytes):
+        clave = serialization.load_pem_private_key(pem, password=None)
+        if isinstance(clave, rsa.RSAPrivateKey):
+            algoritmo = ALGORITHMS.RS256
+        elif isinstance(clave, ec.EllipticCurvePrivateKey) and clave.curve.name == "secp256r1":
+            algoritmo = ALGORITHMS.ES256
+        else:
+            raise ValueError(f"Tipo de clave no soportado para el kid '{kid}' (use RSA o EC P-256)")
+        privada = jwk.construct(pem, algoritmo)
+        self.algoritmos[kid] = algoritmo
+        self.privadas[kid] = privada
+        self.publicas[kid] = privada.public_key()
+
+    def jwks(self) -> dict:
+        """Claves públicas en formato JWK Set (RFC 7517)"""
+        claves = []
+        for kid, publica in self.publicas.items():
+            jwk_dict = publica.to_dict()
+            jwk_dict.update({"kid": kid, "use": "sig", "alg": self.algoritmos[kid]})
+            claves.append(jwk_dict)
+        return {"keys": claves}
+
+def generar_pem_rsa() -> bytes:
+    clave = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return clave.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+def cargar_keyring(directorio: str, kid_activo: str = None, permitir_temporal: bool = True) -> KeyRing:
+    """
+    Carga todas las claves del directorio. Si no hay ninguna y permitir_temporal
+    es True, genera una clave temporal en memoria, válida solo para este proceso
+    (desarrollo con un único worker).
+
+    Raises:
+        RuntimeError: Si no hay claves y no se permite una temporal (varios workers
+            firmarían con claves distintas y rechazarían los tokens de los demás)
+    """
+    ring = KeyRing()
+    if os.path.isdir(directorio):
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith(".pem"):
+                with open(os.path.join(directorio, nombre), "rb") as f:
+                    ring.agregar(nombre[:-4], f.read())
+
+    if not ring.privadas and not permitir_temporal:
+        raise RuntimeError(
+            f"No se encontraron claves JWT en '{directorio}' y la app se ejecuta con varios workers. "
+            f"Genera una con: python -m auth.keyring generar <kid>"
+        )
+    if not ring.privadas:
+        kid = f"temporal-{secrets.token_hex(4)}"
+        ring.agregar(kid, generar_pem_rsa())
+        print(f"⚠️  ADVERTENCIA: no se encontraron claves JWT en '{directorio}'")
+        print(f"🔑 Usando clave RSA temporal generada con kid: {kid}")
+        print(f"💡 Para producción, genera una clave con: python -m auth.keyring generar <kid>")
+
+    ring.kid_activo = kid_activo or sorted(ring.privadas)[-1]
+    if ring.kid_activo not in ring.privadas:
+        raise ValueError(f"JWT_ACTIVE_KID '{ring.kid_activo}' no existe en '{directorio}'")
+    return ring
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] != "generar":
+        print("Uso: python -m auth.keyring generar <kid>")
+        sys.exit(1)
+    kid = sys.argv[2]
+    directorio = os.getenv("JWT_KEYS_DIR", "keys")
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"{kid}.pem")
+    if os.path.exists(ruta):
+        print(f"Ya existe {ruta}")
+        sys.exit(1)
+    with open(ruta, "wb") as f:
+        f.write(generar_pem_rsa())
+    os.chmod(ruta, 0o600)
+    print(f"Clave generada en {ruta}. Actívala con JWT_ACTIVE_KID={kid}")
+
+if __name__ == "__main__":
+    main()
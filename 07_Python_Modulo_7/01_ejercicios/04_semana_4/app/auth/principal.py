@@ -0,0 +1,24 @@
+# app/auth/principal.py
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from models.user_model import User
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Usuario autenticado en las rutas protegidas.
+    
+    Objeto inmutable con __slots__: no arrastra el estado del ORM (identity map,
+    atributos instrumentados) ni queda ligado a una sesión de base de datos.
+    """
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+# Columnas que se consultan para construir un Principal (en el mismo orden que sus campos)
+PRINCIPAL_COLUMNS = (User.id, User.username, User.role, User.is_active, User.created_at, User.updated_at)
@@ -0,0 +1,95 @@
+# app/auth/refresh_service.py
+
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.refresh_token_model import RefreshToken
+
+# Configuración de los refresh tokens desde variables de entorno
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
+# La base de datos es la única fuente de verdad sobre los tokens revocados (la
+# comparten todos los workers y sobrevive a los reinicios). Una rotación normal
+# es un solo UPDATE; solo cuando no encuentra el token se hace un SELECT para
+# distinguir una reutilización de un token inexistente o expirado.
+
+class RefreshTokenInvalido(Exception):
+    """Se lanza cuando un refresh token no existe, expiró o fue revocado"""
+
+def _hash_token(token: str) -> str:
+    # El token tiene 256 bits aleatorios: SHA-256 basta, no hace falta Argon2
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def emitir_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """Crea un refresh token para el usuario (el llamador confirma la transacción)"""
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=_hash_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+async def revocar_tokens_usuario(db: AsyncSession, user_id: int):
+    """Revoca todos los refresh tokens vigentes del usuario"""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+
+async def _detectar_reutilizacion(db: AsyncSession, token_hash: str):
+    """
+    Si el token existe y ya fue revocado, revoca todas las sesiones del usuario.
+
+    Raises:
+        RefreshTokenInvalido: Si el token ya estaba revocado (reutilización)
+    """
+    result = await db.execute(
+        select(RefreshToken.user_id, RefreshToken.revoked_at).where(RefreshToken.token_hash == token_hash)
+    )
+    fila = result.one_or_none()
+    if fila is not None and fila.revoked_at is not None:
+        # Un token ya rotado se está reutilizando: se asume robado y se
+        # revocan todas las sesiones del usuario
+        await revocar_tokens_usuario(db, fila.user_id)
+        await db.commit()
+        raise RefreshTokenInvalido("Refresh token revocado")
+
+async def rotar_refresh_token(db: AsyncSession, token: str) -> tuple:
+    """
+    Revoca el refresh token recibido y emite uno nuevo.
+    
+    Returns:
+        tuple: (user_id, nuevo_refresh_token). El llamador confirma la transacción.
+        
+    Raises:
+        RefreshTokenInvalido: Si el token no existe, expiró o ya fue usado
+    """
+    token_hash = _hash_token(token)
+    ahora = datetime.now(timezone.utc)
+
+    # Rotación atómica: solo una petición puede consumir el token
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > ahora,
+        )
+        .values(revoked_at=ahora)
+        .returning(RefreshToken.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    user_id = result.scalar_one_or_none()
+    if user_id is None:
+        # No existe, expiró o ya fue revocado (quizá por otro worker o antes de un reinicio)
+        await _detectar_reutilizacion(db, token_hash)
+        raise RefreshTokenInvalido("Refresh token inválido o expirado")
+
+    nuevo_token = await emitir_refresh_token(db, user_id)
+    return user_id, nuevo_token
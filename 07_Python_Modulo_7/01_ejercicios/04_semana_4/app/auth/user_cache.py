@@ -0,0 +1,74 @@
+# app/auth/user_cache.py
+
+import os
+import orjson
+from sqlalchemy import event, inspect
+from core.cache import TTLCache
+from models.user_model import User
+from auth.principal import Principal
+
+# Configuración de la caché de usuarios autenticados desde variables de entorno
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # Segundos que una entrada es válida
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))  # Máximo de usuarios en memoria
+# Segundos que se reutiliza la token_version leída de la base de datos
+TOKEN_VERSION_TTL = float(os.getenv("TOKEN_VERSION_TTL", "5"))
+
+# Caché de objetos Principal indexada por el "sub" del token (el username)
+user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+# Respuesta de /me ya codificada en JSON: username -> (Principal de origen, bytes)
+user_json_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+# Permisos actuales leídos de la base de datos: username -> (token_version, role, is_active).
+# La base es la fuente compartida por todos los workers; cada proceso la consulta
+# como mucho una vez cada TOKEN_VERSION_TTL segundos por usuario, así que un
+# cambio hecho en otro worker (o antes de un reinicio) tarda como máximo ese
+# tiempo en invalidar los tokens anteriores. En el proceso que hace el cambio
+# se aplica en el acto.
+token_versions = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=TOKEN_VERSION_TTL)
+
+# Cambios que obligan a volver a emitir el token
+CAMPOS_DE_PERMISOS = ("role", "is_active", "hashed_password")
+
+def usuario_json(principal: Principal) -> bytes:
+    """
+    Devuelve el JSON de UserResponse para el Principal, codificado una sola vez.
+
+    Los bytes solo se reutilizan si se generaron a partir de este mismo objeto
+    Principal; cuando la caché de usuarios lo reemplaza, se vuelven a codificar.
+    """
+    entrada = user_json_cache.get(principal.username)
+    if entrada is not None and entrada[0] is principal:
+        return entrada[1]
+    # Principal tiene los mismos campos que UserResponse; OPT_UTC_Z formatea
+    # las fechas igual que Pydantic ("Z" para UTC)
+    contenido = orjson.dumps(principal, option=orjson.OPT_UTC_Z)
+    user_json_cache.set(principal.username, (principal, contenido))
+    return contenido
+
+# ------------------------------------------------------------
+# Invalidación: cuando una fila de usuario cambia o se borra a través del ORM,
+# se descarta su entrada. Las actualizaciones masivas (update() sin ORM) no
+# disparan estos eventos; en ese caso la entrada caduca al cumplirse el TTL.
+@event.listens_for(User, "before_update")
+def _incrementar_token_version(mapper, connection, target):
+    estado = inspect(target)
+    if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS_DE_PERMISOS):
+        target.token_version = (target.token_version or 0) + 1
+
+@event.listens_for(User, "after_update")
+def _invalidar_tras_update(mapper, connection, target):
+    if inspect(target).attrs.token_version.history.has_changes():
+        token_versions.set(target.username, (target.token_version, target.role, target.is_active))
+    user_cache.invalidar(target.username)
+    user_json_cache.invalidar(target.username)
+    # Si cambió el username también descartamos la clave anterior
+    for anterior in inspect(target).attrs.username.history.deleted:
+        user_cache.invalidar(anterior)
+        user_json_cache.invalidar(anterior)
+
+@event.listens_for(User, "after_delete")
+def _invalidar_tras_delete(mapper, connection, target):
+    user_cache.invalidar(target.username)
+    token_versions.invalidar(target.username)
+    user_json_cache.invalidar(target.username)
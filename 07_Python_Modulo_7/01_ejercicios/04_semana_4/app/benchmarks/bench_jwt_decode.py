@@ -0,0 +1,38 @@
+# app/benchmarks/bench_jwt_decode.py
+#
+# Mide el coste por petición de verificar_token con y sin la caché de tokens.
+# Uso (desde la carpeta app): python benchmarks/bench_jwt_decode.py [iteraciones]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth.auth_handler import crear_token, verificar_token, token_cache
+
+def medir(iteraciones: int, con_cache: bool) -> float:
+    """Devuelve los microsegundos promedio por llamada a verificar_token"""
+    token = crear_token({"sub": "benchmark"})
+    token_cache.limpiar()
+    verificar_token(token)  # Calentamiento (y primera inserción en caché)
+
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        if not con_cache:
+            token_cache.limpiar()  # Forzamos el jwt.decode completo en cada llamada
+        verificar_token(token)
+    return (time.perf_counter() - inicio) / iteraciones * 1_000_000
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sin_cache = medir(iteraciones, con_cache=False)
+    con_cache = medir(iteraciones, con_cache=True)
+
+    print(f"Iteraciones: {iteraciones}")
+    print(f"Sin caché: {sin_cache:8.2f} µs/petición")
+    print(f"Con caché: {con_cache:8.2f} µs/petición")
+    print(f"Mejora:    {sin_cache / con_cache:8.1f}x")
+
+if __name__ == "__main__":
+    main()
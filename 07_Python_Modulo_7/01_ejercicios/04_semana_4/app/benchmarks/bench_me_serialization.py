@@ -0,0 +1,82 @@
+# app/benchmarks/bench_me_serialization.py
+#
+# Mide el CPU por petición de GET /me: la versión anterior (UserResponse.model_validate
+# + validación y serialización de response_model) frente al JSON precodificado con
+# orjson y cacheado junto al Principal. Ambas rutas se sirven en proceso, sin red.
+# Uso (desde la carpeta app): python benchmarks/bench_me_serialization.py [iteraciones]
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from auth.dependencies import get_current_user
+from auth.principal import Principal
+from auth.user_cache import usuario_json, user_json_cache
+from routes.user_routes import get_me
+from schemas.user_schemas import UserResponse
+
+PRINCIPAL = Principal(
+    id=1, username="benchmark", role="user", is_active=True,
+    created_at=datetime(2025, 10, 9, 14, 30, tzinfo=timezone.utc), updated_at=None,
+)
+
+def crear_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/antes", response_model=UserResponse)
+    async def me_antes(current_user: Principal = Depends(get_current_user)):
+        return UserResponse.model_validate(current_user)
+
+    app.get("/despues", response_model=UserResponse)(get_me)
+    # El usuario autenticado es fijo: solo se mide la serialización de la respuesta
+    app.dependency_overrides[get_current_user] = lambda: PRINCIPAL
+    return app
+
+async def medir(client: httpx.AsyncClient, ruta: str, iteraciones: int) -> float:
+    """Devuelve los microsegundos de CPU promedio por petición"""
+    for _ in range(100):
+        await client.get(ruta)  # Calentamiento
+    inicio = time.process_time()
+    for _ in range(iteraciones):
+        await client.get(ruta)
+    return (time.process_time() - inicio) / iteraciones * 1_000_000
+
+def medir_serializacion(iteraciones: int) -> tuple:
+    """Solo el paso de serialización, sin el resto de la pila HTTP"""
+    inicio = time.process_time()
+    for _ in range(iteraciones):
+        UserResponse.model_validate(PRINCIPAL).model_dump_json().encode()
+    antes = (time.process_time() - inicio) / iteraciones * 1_000_000
+
+    user_json_cache.limpiar()
+    inicio = time.process_time()
+    for _ in range(iteraciones):
+        usuario_json(PRINCIPAL)
+    despues = (time.process_time() - inicio) / iteraciones * 1_000_000
+    return antes, despues
+
+async def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    transport = httpx.ASGITransport(app=crear_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        a = (await client.get("/antes")).json()
+        d = (await client.get("/despues")).json()
+        if a != d:
+            raise SystemExit(f"Las respuestas difieren:\n{a}\n{d}")
+        antes = await medir(client, "/antes", iteraciones)
+        despues = await medir(client, "/despues", iteraciones)
+
+    ser_antes, ser_despues = medir_serializacion(iteraciones * 10)
+
+    print(f"Iteraciones: {iteraciones}")
+    print(f"Petición completa  antes: {antes:8.2f} µs CPU   después: {despues:8.2f} µs CPU   ({(1 - despues / antes) * 100:.1f}% menos)")
+    print(f"Solo serialización antes: {ser_antes:8.2f} µs CPU   después: {ser_despues:8.2f} µs CPU   ({ser_antes / ser_despues:.1f}x)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+# app/benchmarks/bench_refresh_queries.py
+#
+# Cuenta las sentencias SQL de cada caso de POST /token/refresh y mide su
+# latencia: rotación normal (UPDATE que consume el token + INSERT del nuevo),
+# token inexistente (UPDATE sin filas + SELECT) y reutilización de un token ya
+# rotado (UPDATE sin filas + SELECT + UPDATE que revoca las sesiones). La rotación
+# normal no hace ninguna consulta previa para buscar el token: ese es el camino
+# que sigue casi todo el tráfico. Usa SQLite en memoria, sin red ni servidor.
+# Uso (desde la carpeta app): python benchmarks/bench_refresh_queries.py [iteraciones]
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from core.database import Base
+from models.user_model import User
+from models.refresh_token_model import RefreshToken  # noqa: F401 (registra la tabla)
+from auth.refresh_service import RefreshTokenInvalido, emitir_refresh_token, rotar_refresh_token
+
+# Sentencias esperadas por caso: la rotación normal no consulta antes de actualizar
+ESPERADAS = {
+    "rotación normal": ["UPDATE", "INSERT"],
+    "token inexistente": ["UPDATE", "SELECT"],
+    "reutilización": ["UPDATE", "SELECT", "UPDATE"],
+}
+
+async def preparar():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sesiones = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with sesiones() as db:
+        usuario = User(username="benchmark", hashed_password="x", role="user")
+        db.add(usuario)
+        await db.commit()
+    return engine, sesiones, usuario.id
+
+async def ejecutar(sesiones, sentencias: list, token: str):
+    """Ejecuta un caso y devuelve las sentencias SQL emitidas"""
+    sentencias.clear()
+    async with sesiones() as db:
+        try:
+            await rotar_refresh_token(db, token)
+            await db.commit()
+        except RefreshTokenInvalido:
+            pass
+    return [s.split(None, 1)[0].upper() for s in sentencias]
+
+async def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    engine, sesiones, user_id = await preparar()
+
+    sentencias = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, many: sentencias.append(sql))
+
+    async with sesiones() as db:
+        token = await emitir_refresh_token(db, user_id)
+        await db.commit()
+
+    tiempos = {caso: 0.0 for caso in ESPERADAS}
+    for _ in range(iteraciones):
+        inicio = time.perf_counter()
+        emitidas = await ejecutar(sesiones, sentencias, token)
+        tiempos["rotación normal"] += time.perf_counter() - inicio
+        if emitidas != ESPERADAS["rotación normal"]:
+            raise SystemExit(f"rotación normal: {emitidas}")
+
+        inicio = time.perf_counter()
+        emitidas = await ejecutar(sesiones, sentencias, "no-existe")
+        tiempos["token inexistente"] += time.perf_counter() - inicio
+        if emitidas != ESPERADAS["token inexistente"]:
+            raise SystemExit(f"token inexistente: {emitidas}")
+
+        inicio = time.perf_counter()
+        emitidas = await ejecutar(sesiones, sentencias, token)  # Ya rotado
+        tiempos["reutilización"] += time.perf_counter() - inicio
+        if emitidas != ESPERADAS["reutilización"]:
+            raise SystemExit(f"reutilización: {emitidas}")
+
+        # La reutilización revocó también el token nuevo: se emite otro para la siguiente vuelta
+        async with sesiones() as db:
+            token = await emitir_refresh_token(db, user_id)
+            await db.commit()
+
+    await engine.dispose()
+    print(f"Iteraciones: {iteraciones}")
+    for caso, esperadas in ESPERADAS.items():
+        print(f"{caso:<18} {len(esperadas)} sentencias {'(' + ', '.join(esperadas) + ')':<24} "
+              f"{tiempos[caso] / iteraciones * 1000:7.3f} ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
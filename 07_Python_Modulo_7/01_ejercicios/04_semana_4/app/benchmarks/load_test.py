@@ -0,0 +1,259 @@
+# app/benchmarks/load_test.py
+#
+# Prueba de carga de la API de autenticación con un driver asyncio + httpx.
+# Ejercita /register, /login, /me y /admin con una mezcla configurable y
+# guarda p50/p95/p99, throughput y tasa de error en un JSON por ejecución.
+#
+# Contra un servidor en marcha (Postgres real):
+#   python benchmarks/load_test.py --url http://127.0.0.1:8000
+#
+# En proceso, sin servidor, usando SQLite como sustituto (requiere aiosqlite):
+#   python benchmarks/load_test.py --sqlite
+#
+# Todas las peticiones salen de la misma IP: para medir el servidor y no el
+# limitador, arrancarlo con límites altos (p. ej. RATE_LIMIT_LOGIN_IP=1000000/1,
+# igual para RATE_LIMIT_LOGIN_USER y RATE_LIMIT_REGISTER_IP). En modo --sqlite
+# se configuran así automáticamente.
+#
+# Comparar dos ejecuciones (p. ej. entre commits):
+#   python benchmarks/load_test.py --comparar resultados/a.json resultados/b.json
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTADOS_DIR = os.path.join(APP_DIR, "benchmarks", "resultados")
+PREFIJO = "/api/v1"
+PASSWORD = "benchmark123"
+
+# Mezcla por defecto: tráfico dominado por peticiones autenticadas
+MEZCLA_DEFECTO = "me=70,admin=15,login=10,register=5"
+
+def parsear_mezcla(texto: str) -> dict:
+    """Convierte 'me=70,login=10' en {'me': 70, 'login': 10}"""
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, peso = parte.split("=")
+        mezcla[nombre.strip()] = float(peso)
+    desconocidas = set(mezcla) - {"register", "login", "me", "admin"}
+    if desconocidas:
+        raise ValueError(f"Operaciones desconocidas en la mezcla: {', '.join(sorted(desconocidas))}")
+    return mezcla
+
+def percentil(valores: list, p: int) -> float:
+    """Percentil p (1-99) de una lista de latencias"""
+    if not valores:
+        return 0.0
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+def commit_actual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+class Estadisticas:
+    """Latencias (ms) y errores por operación"""
+
+    def __init__(self):
+        self.latencias = {}
+        self.errores = {}
+
+    def registrar(self, operacion: str, ms: float, ok: bool):
+        self.latencias.setdefault(operacion, []).append(ms)
+        if not ok:
+            self.errores[operacion] = self.errores.get(operacion, 0) + 1
+
+    def resumen(self, duracion: float) -> dict:
+        resumen = {}
+        for operacion, valores in sorted(self.latencias.items()):
+            errores = self.errores.get(operacion, 0)
+            resumen[operacion] = {
+                "peticiones": len(valores),
+                "errores": errores,
+                "tasa_error": errores / len(valores),
+                "throughput_rps": len(valores) / duracion,
+                "p50_ms": percentil(valores, 50),
+                "p95_ms": percentil(valores, 95),
+                "p99_ms": percentil(valores, 99),
+                "max_ms": max(valores),
+            }
+        todas = [v for valores in self.latencias.values() for v in valores]
+        errores = sum(self.errores.values())
+        resumen["total"] = {
+            "peticiones": len(todas),
+            "errores": errores,
+            "tasa_error": errores / len(todas) if todas else 0.0,
+            "throughput_rps": len(todas) / duracion,
+            "p50_ms": percentil(todas, 50),
+            "p95_ms": percentil(todas, 95),
+            "p99_ms": percentil(todas, 99),
+            "max_ms": max(todas) if todas else 0.0,
+        }
+        return resumen
+
+async def preparar_usuarios(client: httpx.AsyncClient, cantidad: int, prefijo: str) -> list:
+    """Registra usuarios de prueba (uno de cada cinco admin) y devuelve sus tokens"""
+    usuarios = []
+    for i in range(cantidad):
+        username = f"{prefijo}_{i}"
+        role = "admin" if i % 5 == 0 else "user"
+        r = await client.post(f"{PREFIJO}/register", json={"username": username, "password": PASSWORD, "role": role})
+        if r.status_code not in (201, 400):
+            raise RuntimeError(f"No se pudo registrar {username}: {r.status_code} {r.text}")
+        r = await client.post(f"{PREFIJO}/login", json={"username": username, "password": PASSWORD})
+        r.raise_for_status()
+        usuarios.append({"username": username, "role": role, "token": r.json()["access_token"]})
+    return usuarios
+
+async def ejecutar_operacion(client: httpx.AsyncClient, operacion: str, usuarios: list, prefijo: str):
+    """Lanza una petición y devuelve (latencia_ms, ok)"""
+    usuario = random.choice(usuarios)
+    headers = {"Authorization": f"Bearer {usuario['token']}"}
+    inicio = time.perf_counter()
+    if operacion == "register":
+        username = f"{prefijo}_n{uuid.uuid4().hex[:12]}"
+        r = await client.post(f"{PREFIJO}/register", json={"username": username, "password": PASSWORD})
+        ok = r.status_code == 201
+    elif operacion == "login":
+        r = await client.post(f"{PREFIJO}/login", json={"username": usuario["username"], "password": PASSWORD})
+        ok = r.status_code == 200
+    elif operacion == "me":
+        r = await client.get(f"{PREFIJO}/me", headers=headers)
+        ok = r.status_code == 200
+    else:
+        r = await client.get(f"{PREFIJO}/admin", headers=headers)
+        ok = r.status_code == (200 if usuario["role"] == "admin" else 403)
+    return (time.perf_counter() - inicio) * 1000, ok
+
+async def ejecutar_carga(client: httpx.AsyncClient, args) -> dict:
+    prefijo = f"bench{uuid.uuid4().hex[:6]}"
+    usuarios = await preparar_usuarios(client, args.usuarios, prefijo)
+
+    mezcla = parsear_mezcla(args.mezcla)
+    operaciones, pesos = list(mezcla), list(mezcla.values())
+    stats = Estadisticas()
+    fin = time.perf_counter() + args.duracion
+
+    async def worker():
+        while time.perf_counter() < fin:
+            operacion = random.choices(operaciones, pesos)[0]
+            try:
+                ms, ok = await ejecutar_operacion(client, operacion, usuarios, prefijo)
+            except httpx.HTTPError:
+                ms, ok = 0.0, False
+            stats.registrar(operacion, ms, ok)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrencia)))
+    return stats.resumen(time.perf_counter() - inicio)
+
+async def cliente_sqlite(args):
+    """Monta la app en proceso sobre una base SQLite temporal"""
+    sys.path.insert(0, APP_DIR)
+    for variable in ("RATE_LIMIT_LOGIN_IP", "RATE_LIMIT_LOGIN_USER", "RATE_LIMIT_REGISTER_IP"):
+        os.environ.setdefault(variable, "1000000/1")
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    import core.database as database
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    database.engine = create_async_engine(f"sqlite+aiosqlite:///{ruta}")
+    database.SessionLocal = async_sessionmaker(
+        bind=database.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    from core.migraciones import migrar
+    await asyncio.to_thread(migrar)  # Crea el esquema en la base temporal (el lifespan solo lo verifica)
+    import main  # Se importa después de sustituir el engine para que lo use el lifespan
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await ejecutar_carga(client, args)
+
+async def cliente_http(args):
+    limites = httpx.Limits(max_connections=args.concurrencia, max_keepalive_connections=args.concurrencia)
+    async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=args.timeout) as client:
+        return await ejecutar_carga(client, args)
+
+def imprimir(resumen: dict):
+    print(f"{'operación':<10} {'peticiones':>10} {'err%':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for operacion, r in resumen.items():
+        print(
+            f"{operacion:<10} {r['peticiones']:>10} {r['tasa_error'] * 100:>6.2f} {r['throughput_rps']:>8.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        )
+
+def comparar(ruta_a: str, ruta_b: str):
+    """Muestra la variación de p50/p95/p99 y throughput entre dos resultados"""
+    with open(ruta_a, encoding="utf-8") as f:
+        a = json.load(f)
+    with open(ruta_b, encoding="utf-8") as f:
+        b = json.load(f)
+    print(f"{a['commit']} -> {b['commit']}")
+    print(f"{'operación':<10} {'métrica':<15} {'antes':>10} {'después':>10} {'cambio':>8}")
+    for operacion in a["resultados"]:
+        if operacion not in b["resultados"]:
+            continue
+        for metrica in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "tasa_error"):
+            antes, despues = a["resultados"][operacion][metrica], b["resultados"][operacion][metrica]
+            cambio = (despues - antes) / antes * 100 if antes else 0.0
+            print(f"{operacion:<10} {metrica:<15} {antes:>10.2f} {despues:>10.2f} {cambio:>7.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de autenticación")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL base del servidor")
+    parser.add_argument("--sqlite", action="store_true", help="Ejecutar la app en proceso sobre SQLite")
+    parser.add_argument("--duracion", type=float, default=30, help="Segundos de carga")
+    parser.add_argument("--concurrencia", type=int, default=50, help="Peticiones simultáneas")
+    parser.add_argument("--usuarios", type=int, default=20, help="Usuarios de prueba a registrar")
+    parser.add_argument("--mezcla", default=MEZCLA_DEFECTO, help="Pesos por operación, p. ej. me=70,login=10")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout por petición en segundos")
+    parser.add_argument("--salida", help="Ruta del JSON de resultados (por defecto benchmarks/resultados/)")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DESPUES"), help="Comparar dos JSON de resultados")
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    resumen = asyncio.run(cliente_sqlite(args) if args.sqlite else cliente_http(args))
+    imprimir(resumen)
+
+    commit = commit_actual()
+    fecha = datetime.now(timezone.utc)
+    salida = args.salida or os.path.join(RESULTADOS_DIR, f"{fecha:%Y%m%dT%H%M%SZ}_{commit}.json")
+    os.makedirs(os.path.dirname(salida), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "fecha": fecha.isoformat(),
+            "destino": "sqlite" if args.sqlite else args.url,
+            "parametros": {
+                "duracion": args.duracion,
+                "concurrencia": args.concurrencia,
+                "usuarios": args.usuarios,
+                "mezcla": parsear_mezcla(args.mezcla),
+            },
+            "resultados": resumen,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {salida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+class TTLCache:
+    """
+    Caché en memoria con expiración por tiempo (TTL) y desalojo LRU.
+
+    Las entradas caducan al cumplirse su TTL y, si se alcanza maxsize,
+    se descarta la usada hace más tiempo. Es segura entre hilos.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos: OrderedDict = OrderedDict()  # clave -> (expira_en, valor)
+        self._lock = Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave, default=None):
+        """Devuelve el valor cacheado o default si no existe o ya expiró"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return default
+            expira_en, valor = entrada
+            if expira_en <= ahora:
+                del self._datos[clave]
+                self.fallos += 1
+                return default
+            self._datos.move_to_end(clave)  # Marcamos la entrada como usada recientemente
+            self.aciertos += 1
+            return valor
+
+    def set(self, clave, valor, ttl: float = None):
+        """Guarda un valor; ttl permite fijar una expiración distinta a la por defecto"""
+        expira_en = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._datos[clave] = (expira_en, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)  # Desalojamos la entrada menos usada
+
+    def invalidar(self, clave):
+        """Elimina una entrada si existe"""
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
@@ -0,0 +1,90 @@
+# app/core/calentamiento.py
+#
+# Calentamiento del worker antes de recibir tráfico.
+#
+# Sin él, las primeras peticiones tras un despliegue pagan la apertura de
+# conexiones a Postgres, la carga del backend de Argon2 y la creación de los
+# hilos del pool de hashing, la preparación de las claves JWT y la generación
+# del esquema OpenAPI. GET /ready responde 503 hasta que termina, para que el
+# balanceador no envíe peticiones a un worker frío.
+
+import asyncio
+import logging
+import os
+import time
+from sqlalchemy import text
+from core.database import engine, DB_POOL_SIZE
+from auth.auth_service import HASH_MAX_WORKERS, hash_many_async, verify_async
+from auth.auth_handler import crear_token, verificar_token, olvidar_token
+from auth.principal import Principal
+from auth.user_cache import usuario_json, user_json_cache
+from schemas.user_schemas import UserResponse
+
+logger = logging.getLogger(__name__)
+
+# Conexiones del pool que se abren por adelantado (0 desactiva esta fase)
+WARMUP_DB_CONNECTIONS = min(int(os.getenv("WARMUP_DB_CONNECTIONS", str(DB_POOL_SIZE))), DB_POOL_SIZE)
+
+class EstadoCalentamiento:
+    """Estado que consulta /ready"""
+
+    def __init__(self):
+        self.listo = False
+        self.error = None
+        self.fases = {}  # fase -> segundos
+
+estado = EstadoCalentamiento()
+
+async def _abrir_conexiones(cantidad: int):
+    """Abre `cantidad` conexiones a la vez y las devuelve al pool, donde quedan inactivas"""
+    conexiones = await asyncio.gather(*(engine.connect() for _ in range(cantidad)))
+    try:
+        for conexion in conexiones:
+            await conexion.execute(text("SELECT 1"))
+    finally:
+        for conexion in conexiones:
+            await conexion.close()
+
+async def _calentar_hashing():
+    """Carga argon2 y arranca todos los hilos del pool (un hash por hilo, en paralelo)"""
+    hashes = await hash_many_async(["calentamiento"] * HASH_MAX_WORKERS)
+    await verify_async("calentamiento", hashes[0])
+
+def _calentar_jwt():
+    """Firma y verifica un token para inicializar las claves del llavero"""
+    token = crear_token({"sub": "calentamiento"})
+    verificar_token(token)
+    # Solo la entrada del token sintético: la caché puede tener ya tokens de usuarios reales
+    olvidar_token(token)
+
+def _calentar_modelos(app):
+    """Genera el esquema OpenAPI y ejercita la serialización de las respuestas"""
+    app.openapi()
+    principal = Principal(id=0, username="calentamiento", role="user", is_active=True)
+    UserResponse.model_validate(principal).model_dump_json()
+    usuario_json(principal)
+    user_json_cache.invalidar(principal.username)
+
+async def calentar(app):
+    """Ejecuta todas las fases y marca el worker como listo; un fallo queda en estado.error"""
+    fases = [
+        ("db", lambda: _abrir_conexiones(WARMUP_DB_CONNECTIONS) if WARMUP_DB_CONNECTIONS > 0 else None),
+        ("hash", _calentar_hashing),
+        ("jwt", _calentar_jwt),
+        ("modelos", lambda: _calentar_modelos(app)),
+    ]
+    inicio_total = time.perf_counter()
+    try:
+        for nombre, fase in fases:
+            inicio = time.perf_counter()
+            resultado = fase()
+            if asyncio.iscoroutine(resultado):
+                await resultado
+            estado.fases[nombre] = time.perf_counter() - inicio
+    except Exception as e:
+        estado.error = f"{type(e).__name__}: {e}"
+        logger.error(f"Error durante el calentamiento: {estado.error}")
+        return
+    estado.listo = True
+    detalle = ", ".join(f"{nombre}={segundos * 1000:.0f}ms" for nombre, segundos in estado.fases.items())
+    logger.info(f"Worker listo en {(time.perf_counter() - inicio_total) * 1000:.0f}ms ({detalle})")
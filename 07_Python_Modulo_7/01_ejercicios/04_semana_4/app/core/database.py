@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine  # Permite crear el motor de conexión a la base de datos
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession  # Motor y sesiones asíncronas (no bloquean el event loop)
 from sqlalchemy.ext.declarative import declarative_base  # Permite definir clases ORM que se traducen a tablas
-from sqlalchemy.orm import sessionmaker  # Permite crear sesiones para interactuar con la base de datos
 from sqlalchemy.exc import SQLAlchemyError  # Para capturar errores específicos de SQLAlchemy
+import logging  # Para registrar la configuración efectiva del pool
+import os  # Permite leer la configuración del pool desde variables de entorno
+
+logger = logging.getLogger(__name__)
 
 # Configuración directa de PostgreSQL
 DB_USER = "postgres"  # Usuario de la base de datos
@@ -10,24 +13,64 @@ DB_HOST = "localhost"  # Dirección del host de la base de datos
 DB_PORT = "5432"  # Puerto donde escucha PostgreSQL
 DB_NAME = "autenticacion"  # Nombre de la base de datos
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Driver asyncpg: las consultas se esperan con await y liberan el event loop mientras Postgres responde
+DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Configuración del pool de conexiones (dimensionar según el número de workers:
+# conexiones máximas por worker = DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # Conexiones que se mantienen abiertas
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Conexiones extra permitidas en picos
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Segundos de espera por una conexión libre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Segundos antes de reciclar una conexión
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")  # Verifica la conexión antes de usarla
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # Tiempo máximo por sentencia (0 = sin límite)
+
+connect_args = {}
+if DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}  # Parámetro de sesión de asyncpg
 
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # expire_on_commit=False evita recargas implícitas (lazy load) tras el commit, no permitidas en modo asíncrono
+    SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
     Base = declarative_base()
 
 except SQLAlchemyError as e:
     raise Exception(f"Error al conectar con la base de datos: {str(e)}")
 
-def get_db():
-    db = SessionLocal()  # Se crea una nueva sesión a partir de SessionLocal
-    try:
-        yield db  # Se "entrega" la sesión al bloque que la necesite (por ejemplo, un endpoint)
-    except SQLAlchemyError as e:
-        db.rollback()  # Si ocurre un error, se hace rollback de cualquier cambio no confirmado
-        raise Exception(f"Error en la operación de base de datos: {str(e)}")  # Se lanza una excepción personalizada
-    finally:
-        db.close()  # Siempre se cierra la sesión, haya error o no, para liberar recursos
+async def get_db():
+    async with SessionLocal() as db:  # Se crea una nueva sesión asíncrona que se cierra al salir del bloque
+        try:
+            yield db  # Se "entrega" la sesión al bloque que la necesite (por ejemplo, un endpoint)
+        except SQLAlchemyError as e:
+            await db.rollback()  # Si ocurre un error, se hace rollback de cualquier cambio no confirmado
+            raise Exception(f"Error en la operación de base de datos: {str(e)}")  # Se lanza una excepción personalizada
+
+def log_pool_config():
+    """Registra los parámetros efectivos del pool de conexiones"""
+    logger.info(
+        f"Pool de conexiones: pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}, "
+        f"pool_timeout={DB_POOL_TIMEOUT}s, pool_recycle={DB_POOL_RECYCLE}s, "
+        f"pre_ping={DB_POOL_PRE_PING}, statement_timeout={DB_STATEMENT_TIMEOUT_MS}ms"
+    )
+
+def estado_pool() -> dict:
+    """Devuelve el estado actual del pool (conexiones en uso y libres)"""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),  # Conexiones prestadas a sesiones activas
+        "idle": pool.checkedin(),  # Conexiones abiertas disponibles
+        "overflow": max(pool.overflow(), 0),  # Conexiones extra por encima de pool_size
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
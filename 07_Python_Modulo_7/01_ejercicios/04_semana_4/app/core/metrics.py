@@ -0,0 +1,134 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from sqlalchemy import event
+
+# Límites (en segundos) de los buckets de los histogramas
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tiempos acumulados de la petición en curso: {"db": s, "hash": s, "jwt": s}
+_tiempos_peticion: ContextVar = ContextVar("tiempos_peticion", default=None)
+
+class Histograma:
+    """Histograma acumulativo con etiquetas, en formato Prometheus"""
+
+    def __init__(self, nombre: str, descripcion: str, etiquetas: tuple):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.etiquetas = etiquetas
+        self._series = {}  # valores de etiquetas -> [conteos por bucket, suma, total]
+        self._lock = Lock()
+
+    def observar(self, segundos: float, *valores):
+        indice = bisect_left(BUCKETS, segundos)
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += segundos
+            serie[2] += 1
+
+    def exportar(self) -> list:
+        lineas = [f"# HELP {self.nombre} {self.descripcion}", f"# TYPE {self.nombre} histogram"]
+        with self._lock:
+            series = [(valores, list(conteos), suma, total) for valores, (conteos, suma, total) in self._series.items()]
+        for valores, conteos, suma, total in sorted(series):
+            etiquetas = ",".join(f'{k}="{v}"' for k, v in zip(self.etiquetas, valores))
+            separador = "," if etiquetas else ""
+            acumulado = 0
+            for limite, conteo in zip(BUCKETS + ("+Inf",), conteos):
+                acumulado += conteo
+                lineas.append(f'{self.nombre}_bucket{{{etiquetas}{separador}le="{limite}"}} {acumulado}')
+            sufijo = f"{{{etiquetas}}}" if etiquetas else ""
+            lineas.append(f"{self.nombre}_sum{sufijo} {suma}")
+            lineas.append(f"{self.nombre}_count{sufijo} {total}")
+        return lineas
+
+# ------------------------------------------------------------
+# Métricas de la aplicación
+http_latencia = Histograma("http_request_duration_seconds", "Latencia de las peticiones HTTP", ("method", "route", "status"))
+db_latencia = Histograma("db_query_duration_seconds", "Tiempo de ejecución de sentencias SQL", ())
+hash_latencia = Histograma("password_hash_duration_seconds", "Tiempo de cálculo de Argon2", ("operation",))
+hash_espera = Histograma("password_hash_queue_wait_seconds", "Espera en la cola del pool de hashing", ("operation",))
+jwt_latencia = Histograma("jwt_duration_seconds", "Tiempo de codificación/decodificación JWT", ("operation",))
+
+HISTOGRAMAS = (http_latencia, db_latencia, hash_latencia, hash_espera, jwt_latencia)
+
+def acumular(componente: str, segundos: float):
+    """Suma tiempo al componente (db, hash, jwt) de la petición en curso"""
+    tiempos = _tiempos_peticion.get()
+    if tiempos is not None:
+        tiempos[componente] = tiempos.get(componente, 0.0) + segundos
+
+@contextmanager
+def medir_jwt(operacion: str):
+    """Mide una operación JWT (encode/decode)"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        jwt_latencia.observar(duracion, operacion)
+        acumular("jwt", duracion)
+
+def registrar_hash(operacion: str, espera: float, duracion: float):
+    """Registra la espera en cola y el tiempo de cálculo de un hash"""
+    hash_espera.observar(espera, operacion)
+    hash_latencia.observar(duracion, operacion)
+    acumular("hash", duracion)
+
+def iniciar_peticion() -> dict:
+    """Crea el acumulador de tiempos para la petición actual"""
+    tiempos = {}
+    _tiempos_peticion.set(tiempos)
+    return tiempos
+
+def plantilla_ruta(scope: dict) -> str:
+    """
+    Devuelve la plantilla de la ruta atendida (/api/v1/me) en lugar de la URL
+    concreta, para no crear una serie por cada valor de los parámetros.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "sin_ruta"
+    # Las versiones recientes de FastAPI guardan la ruta de un router incluido
+    # sin su prefijo; lo recuperamos a partir de la URL concreta
+    try:
+        concreta = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError):
+        return route.path
+    path = scope.get("path", "")
+    if path.endswith(concreta):
+        return path[:len(path) - len(concreta)] + route.path
+    return route.path
+
+def server_timing(total: float, tiempos: dict) -> str:
+    """Construye el valor del header Server-Timing (en milisegundos)"""
+    partes = [f"app;dur={total * 1000:.2f}"]
+    for componente in ("db", "hash", "jwt"):
+        if componente in tiempos:
+            partes.append(f"{componente};dur={tiempos[componente] * 1000:.2f}")
+    return ", ".join(partes)
+
+def exportar_prometheus() -> str:
+    """Devuelve todas las métricas en formato de texto de Prometheus"""
+    lineas = []
+    for histograma in HISTOGRAMAS:
+        lineas.extend(histograma.exportar())
+    return "\n".join(lineas) + "\n"
+
+def instrumentar_engine(engine):
+    """Mide cada sentencia SQL mediante los eventos de cursor del engine (síncrono)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_sentencia", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info["inicio_sentencia"].pop()
+        db_latencia.observar(duracion)
+        acumular("db", duracion)
@@ -0,0 +1,144 @@
+# app/core/rate_limit.py
+#
+# Limitación de peticiones con token buckets.
+#
+# Cada clave (p. ej. "login:ip:1.2.3.4") tiene un cubo de `capacidad` tokens
+# que se rellena de forma continua a razón de capacidad/periodo tokens por
+# segundo; cada petición consume uno. Cuando el cubo está vacío se rechaza la
+# petición y se indica cuántos segundos faltan para el siguiente token.
+#
+# El estado se guarda en un backend intercambiable:
+#   - "memoria": por proceso (cada worker lleva su propia cuenta)
+#   - "redis": compartido entre workers; acepta cualquier cliente asíncrono con
+#     el método eval() de redis.asyncio (por ejemplo un Redis local o fakeredis)
+
+import math
+import os
+import time
+from threading import Lock
+from core.cache import TTLCache
+
+# Configuración del backend desde variables de entorno
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memoria")  # memoria | redis
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_MAX_CLAVES = int(os.getenv("RATE_LIMIT_MAX_CLAVES", "100000"))  # Cubos en memoria como máximo
+
+def parsear_limite(texto: str) -> tuple:
+    """Convierte '5/60' (5 peticiones cada 60 segundos) en (capacidad, tokens por segundo)"""
+    capacidad, periodo = texto.split("/")
+    capacidad, periodo = int(capacidad), float(periodo)
+    if capacidad <= 0 or periodo <= 0:
+        raise ValueError(f"Límite inválido: '{texto}'")
+    return capacidad, capacidad / periodo
+
+def _rellenar(tokens: float, ultimo: float, capacidad: int, tasa: float, ahora: float, coste: int) -> tuple:
+    """Aplica el relleno desde `ultimo` y el consumo; devuelve (tokens, permitido, espera)"""
+    tokens = min(capacidad, tokens + max(0.0, ahora - ultimo) * tasa)
+    if tokens >= coste:
+        return tokens - coste, True, 0.0
+    return tokens, False, (coste - tokens) / tasa
+
+class MemoriaBackend:
+    """Cubos en memoria del proceso; un cubo inactivo se descarta cuando ya estaría lleno"""
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_CLAVES):
+        self._cubos = TTLCache(maxsize=maxsize)
+        self._lock = Lock()
+
+    async def consumir(self, clave: str, capacidad: int, tasa: float, coste: int = 1) -> tuple:
+        ahora = time.time()
+        with self._lock:
+            tokens, ultimo = self._cubos.get(clave, (capacidad, ahora))
+            tokens, permitido, espera = _rellenar(tokens, ultimo, capacidad, tasa, ahora, coste)
+            self._cubos.set(clave, (tokens, ahora), ttl=capacidad / tasa)
+        return permitido, espera
+
+# Mismo algoritmo que _rellenar, ejecutado de forma atómica dentro de Redis.
+# La espera se devuelve como texto porque Redis trunca los números de Lua a enteros.
+_SCRIPT_REDIS = """
+local datos = redis.call('HMGET', KEYS[1], 'tokens', 'ultimo')
+local capacidad = tonumber(ARGV[1])
+local tasa = tonumber(ARGV[2])
+local ahora = tonumber(ARGV[3])
+local coste = tonumber(ARGV[4])
+local tokens = tonumber(datos[1]) or capacidad
+local ultimo = tonumber(datos[2]) or ahora
+tokens = math.min(capacidad, tokens + math.max(0, ahora - ultimo) * tasa)
+local permitido = 0
+local espera = 0
+if tokens >= coste then
+    tokens = tokens - coste
+    permitido = 1
+else
+    espera = (coste - tokens) / tasa
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ultimo', tostring(ahora))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacidad / tasa * 1000))
+return {permitido, tostring(espera)}
+"""
+
+class RedisBackend:
+    """Cubos compartidos en Redis (o en cualquier cliente compatible con eval())"""
+
+    def __init__(self, cliente, prefijo: str = "rate:"):
+        self.cliente = cliente
+        self.prefijo = prefijo
+
+    async def consumir(self, clave: str, capacidad: int, tasa: float, coste: int = 1) -> tuple:
+        permitido, espera = await self.cliente.eval(
+            _SCRIPT_REDIS, 1, self.prefijo + clave, capacidad, repr(tasa), repr(time.time()), coste
+        )
+        if isinstance(espera, bytes):
+            espera = espera.decode()
+        return bool(int(permitido)), float(espera)
+
+def crear_backend():
+    """Crea el backend configurado en RATE_LIMIT_BACKEND"""
+    if RATE_LIMIT_BACKEND == "memoria":
+        return MemoriaBackend()
+    if RATE_LIMIT_BACKEND == "redis":
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere el paquete 'redis'") from e
+        return RedisBackend(redis_asyncio.from_url(RATE_LIMIT_REDIS_URL))
+    raise ValueError(f"RATE_LIMIT_BACKEND desconocido: '{RATE_LIMIT_BACKEND}'")
+
+class RateLimitExcedido(Exception):
+    """Se agotaron los tokens de alguna de las claves comprobadas"""
+
+    def __init__(self, clave: str, espera: float):
+        super().__init__(f"Límite de peticiones excedido para '{clave}'")
+        self.clave = clave
+        self.retry_after = max(1, math.ceil(espera))  # Segundos enteros para el header Retry-After
+
+class CosteExcedeCapacidad(Exception):
+    """El coste pedido supera la capacidad del cubo: no se atendería nunca (413)"""
+
+    def __init__(self, clave: str, coste: int, capacidad: int):
+        super().__init__(f"Coste {coste} mayor que la capacidad {capacidad} de '{clave}'")
+        self.clave = clave
+        self.coste = coste
+        self.capacidad = capacidad
+
+class RateLimiter:
+    """Aplica límites con nombre (capacidad, tasa) sobre un backend"""
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else crear_backend()
+
+    async def comprobar(self, nombre: str, valor: str, limite: tuple, coste: int = 1):
+        """
+        Consume `coste` tokens del cubo nombre:valor.
+
+        Raises:
+            RateLimitExcedido: Si el cubo no tiene tokens suficientes
+            CosteExcedeCapacidad: Si el coste es mayor que la capacidad (no se consume nada)
+        """
+        capacidad, tasa = limite
+        clave = f"{nombre}:{valor}"
+        if coste > capacidad:
+            raise CosteExcedeCapacidad(clave, coste, capacidad)
+        permitido, espera = await self.backend.consumir(clave, capacidad, tasa, coste)
+        if not permitido:
+            raise RateLimitExcedido(clave, espera)
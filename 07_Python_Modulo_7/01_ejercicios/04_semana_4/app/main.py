@@ -2,16 +2,34 @@
 
 # Importamos FastAPI para crear la aplicación web y HTTPException para manejo de errores
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
+
+# Respuesta JSON codificada con orjson (las rutas con response_model usan la serialización de Pydantic)
+from core.respuestas import ORJSONResponse
 
 # Importamos middleware de CORS para permitir peticiones desde otros dominios
 from fastapi.middleware.cors import CORSMiddleware
 
 # Importamos la base declarativa y el motor de la base de datos
-from core.database import Base, engine
+from core.database import engine, log_pool_config, estado_pool
+
+# Importamos la verificación de la revisión de esquema (las tablas se crean con migraciones)
+from core.migraciones import verificar_esquema
+
+# Importamos las métricas de rendimiento (latencias, tiempo de DB, hashing y JWT)
+from core.metrics import instrumentar_engine, iniciar_peticion, plantilla_ruta, server_timing, http_latencia, exportar_prometheus
+
+# Importamos las claves públicas JWT para publicarlas como JWKS
+from auth.auth_handler import obtener_jwks
 
-# Importamos el modelo User para que se cree la tabla
-from models.user_model import User
+# Importamos el pool de hashing para poder cerrarlo y manejar su saturación
+from auth.auth_service import HashPoolSaturado, cerrar_pool_hashing
+
+# Importamos la excepción de límite de peticiones para responder 429
+from core.rate_limit import RateLimitExcedido, CosteExcedeCapacidad
+
+# Importamos el calentamiento del worker (pool de conexiones, hashing, JWT y modelos)
+from core.calentamiento import calentar, estado as estado_calentamiento
 
 # Importamos las rutas de usuario con un alias
 from routes.user_routes import router as user_router
@@ -22,6 +40,12 @@ import logging
 # Importamos contextlib para manejar eventos de ciclo de vida
 from contextlib import asynccontextmanager
 
+# Importamos time para medir la duración de cada petición
+import time
+
+# Importamos asyncio para ejecutar el calentamiento en segundo plano
+import asyncio
+
 # ------------------------------------------------------------
 # Configuración del sistema de logging para monitoreo de errores
 logging.basicConfig(
@@ -37,15 +61,26 @@ async def lifespan(app: FastAPI):
     """Gestiona el inicio y cierre de la aplicación"""
     # Código que se ejecuta al iniciar
     try:
-        Base.metadata.create_all(bind=engine)  # Ejecuta la creación de todas las tablas definidas en los modelos
-        logger.info("Base de datos inicializada correctamente")  # Mensaje de éxito
+        # El esquema lo crean las migraciones (python -m core.migraciones); aquí
+        # solo se comprueba que la base esté en la revisión que espera el código
+        async with engine.connect() as conn:
+            revision = await conn.run_sync(verificar_esquema)
+        logger.info(f"Base de datos en la revisión de esquema {revision}")  # Mensaje de éxito
+        log_pool_config()  # Deja constancia de la configuración efectiva del pool
     except Exception as e:
         logger.error(f"Error al inicializar la base de datos: {str(e)}")  # Mensaje de error
         raise  # Lanza nuevamente la excepción para detener la aplicación si hay fallo
     
+    # Calentamiento en segundo plano: /ready responde 503 hasta que termine
+    calentamiento = asyncio.create_task(calentar(app))
+    
     yield  # Aquí la aplicación está en ejecución
     
-    # Código que se ejecuta al cerrar (si fuera necesario en el futuro)
+    # Código que se ejecuta al cerrar: dejamos de estar listos y liberamos las conexiones del pool
+    estado_calentamiento.listo = False
+    calentamiento.cancel()
+    await engine.dispose()
+    await cerrar_pool_hashing()
     logger.info("Aplicación finalizando...")
 
 # ------------------------------------------------------------
@@ -67,16 +102,97 @@ app.add_middleware(
     allow_headers=["*"],  # Permite todos los encabezados personalizados
 )
 
+# ------------------------------------------------------------
+# Medición del tiempo de cada sentencia SQL (eventos de cursor del engine)
+instrumentar_engine(engine.sync_engine)
+
+# ------------------------------------------------------------
+# Middleware de instrumentación: latencia por ruta y header Server-Timing
+@app.middleware("http")
+async def medir_peticion(request: Request, call_next):
+    tiempos = iniciar_peticion()  # Acumulador de tiempos de DB, hashing y JWT de esta petición
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - inicio
+
+    ruta = plantilla_ruta(request.scope)  # /api/v1/me, sin valores concretos de parámetros
+    http_latencia.observar(total, request.method, ruta, str(response.status_code))
+
+    response.headers["Server-Timing"] = server_timing(total, tiempos)
+    return response
+
+# ------------------------------------------------------------
+# Manejador para cuando el pool de hashing no admite más peticiones
+@app.exception_handler(HashPoolSaturado)
+async def hash_pool_saturado_handler(request: Request, exc: HashPoolSaturado):
+    logger.warning(f"Pool de hashing saturado: {str(exc)}")
+    return ORJSONResponse(
+        status_code=503,  # Servicio no disponible temporalmente
+        content={"detail": "Servidor ocupado, intente de nuevo"},
+        headers={"Retry-After": "1"}
+    )
+
+# ------------------------------------------------------------
+# Manejador para cuando un cliente supera el límite de peticiones
+@app.exception_handler(RateLimitExcedido)
+async def rate_limit_handler(request: Request, exc: RateLimitExcedido):
+    logger.warning(str(exc))
+    return ORJSONResponse(
+        status_code=429,  # Demasiadas peticiones
+        content={"detail": "Demasiados intentos, intente más tarde"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# ------------------------------------------------------------
+# Manejador para peticiones cuyo coste supera la capacidad del límite (p. ej. un lote demasiado grande)
+@app.exception_handler(CosteExcedeCapacidad)
+async def coste_excede_capacidad_handler(request: Request, exc: CosteExcedeCapacidad):
+    logger.warning(str(exc))
+    return ORJSONResponse(
+        status_code=413,  # Petición demasiado grande
+        content={"detail": f"El lote supera el máximo de {exc.capacidad} usuarios permitido"}
+    )
+
 # ------------------------------------------------------------
 # Manejador global de errores no controlados
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Error no manejado: {str(exc)}")  # Registra el error
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,  # Error interno del servidor
         content={"detail": "Error interno del servidor"}
     )
 
+# ------------------------------------------------------------
+# Endpoint de salud del pool de conexiones a la base de datos
+@app.get("/health/db", tags=["Salud"], summary="Estado del pool de conexiones", response_class=ORJSONResponse)
+async def health_db():
+    return estado_pool()
+
+# ------------------------------------------------------------
+# Endpoint de readiness: 200 solo cuando el worker terminó de calentarse
+@app.get("/ready", tags=["Salud"], summary="Worker listo para recibir tráfico", response_class=ORJSONResponse)
+async def ready():
+    if not estado_calentamiento.listo:
+        return ORJSONResponse(
+            status_code=503,  # Aún calentando (o falló el calentamiento)
+            content={"listo": False, "error": estado_calentamiento.error},
+            headers={"Retry-After": "1"}
+        )
+    return {"listo": True, "fases_ms": {fase: round(s * 1000, 1) for fase, s in estado_calentamiento.fases.items()}}
+
+# ------------------------------------------------------------
+# Claves públicas de verificación de JWT (JWKS)
+@app.get("/.well-known/jwks.json", tags=["Autenticación"], summary="Claves públicas JWT (JWKS)", response_class=ORJSONResponse)
+async def jwks():
+    return obtener_jwks()
+
+# ------------------------------------------------------------
+# Endpoint de métricas en formato Prometheus
+@app.get("/metrics", tags=["Salud"], summary="Métricas en formato Prometheus", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
 # ------------------------------------------------------------
 # Incluir el conjunto de rutas definidas en el archivo user_routes
 app.include_router(user_router, prefix="/api/v1")  # Todas las rutas estarán bajo /api/v1 (ej: /api/v1/login)
@@ -84,7 +200,7 @@ app.include_router(user_router, prefix="/api/v1")  # Todas las rutas estarán ba
 # ------------------------------------------------------------
 # Punto de entrada principal de la aplicación
 def main():
-    """Función principal para iniciar el servidor"""
+    """Función principal para iniciar el servidor de desarrollo (producción: python -m core.servidor)"""
     import uvicorn
     import webbrowser
     from threading import Timer
@@ -0,0 +1,45 @@
+# Entorno de Alembic para el engine asíncrono (asyncpg) de la aplicación
+
+import asyncio
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+
+# Permite ejecutar también "alembic ..." desde la carpeta app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import database
+from models import user_model, refresh_token_model  # Registran sus tablas en Base.metadata
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configurar_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = database.Base.metadata
+
+def run_migrations_offline():
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(
+        url=database.engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def _ejecutar_migraciones(connection):
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_migrations_online():
+    async with database.engine.connect() as connection:
+        await connection.run_sync(_ejecutar_migraciones)
+    await database.engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
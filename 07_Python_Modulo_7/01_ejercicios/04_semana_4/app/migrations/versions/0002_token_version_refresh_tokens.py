@@ -0,0 +1,48 @@
+"""users.token_version y tabla refresh_tokens
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Las bases creadas con create_all() cuando el modelo ya incluía alguno de estos
+cambios se marcan con stamp en 0001 igual que las demás: por eso solo se crea
+lo que todavía no existe (en modo offline, --sql, se genera todo).
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    offline = context.is_offline_mode()
+    inspector = None if offline else sa.inspect(op.get_bind())
+
+    if offline or "token_version" not in {c["name"] for c in inspector.get_columns("users")}:
+        op.add_column("users", sa.Column(
+            "token_version", sa.Integer(), server_default="0", nullable=False,
+            comment="Versión de los permisos; invalida tokens emitidos con una versión anterior",
+        ))
+
+    if offline or not inspector.has_table("refresh_tokens"):
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("id", sa.Integer(), primary_key=True, comment="ID único del refresh token"),
+            sa.Column(
+                "user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+                comment="Usuario al que pertenece el token",
+            ),
+            sa.Column("token_hash", sa.String(64), nullable=False, comment="Hash SHA-256 (hex) del refresh token"),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False, comment="Fecha y hora de expiración"),
+            sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True, comment="Fecha y hora de revocación (nulo si sigue vigente)"),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), comment="Fecha y hora de emisión"),
+        )
+        op.create_index(op.f("ix_refresh_tokens_id"), "refresh_tokens", ["id"])
+        op.create_index(op.f("ix_refresh_tokens_user_id"), "refresh_tokens", ["user_id"])
+        op.create_index(op.f("ix_refresh_tokens_token_hash"), "refresh_tokens", ["token_hash"], unique=True)
+
+def downgrade():
+    op.drop_table("refresh_tokens")
+    op.drop_column("users", "token_version")
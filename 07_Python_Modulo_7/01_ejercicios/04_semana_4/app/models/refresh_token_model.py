@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from core.database import Base
+
+class RefreshToken(Base):
+    """
+    Refresh token emitido a un usuario.
+    
+    Solo se guarda el hash SHA-256 del token; el valor en claro lo conoce únicamente el cliente.
+    Cada uso lo revoca y emite uno nuevo (rotación).
+    """
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True, comment="ID único del refresh token")
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+        comment="Usuario al que pertenece el token"
+    )
+    token_hash = Column(
+        String(64),
+        unique=True,
+        index=True,
+        nullable=False,
+        comment="Hash SHA-256 (hex) del refresh token"
+    )
+    expires_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Fecha y hora de expiración"
+    )
+    revoked_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Fecha y hora de revocación (nulo si sigue vigente)"
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        comment="Fecha y hora de emisión"
+    )
+    
+    def __repr__(self):
+        """Representación string del objeto RefreshToken"""
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id})>"
@@ -40,6 +40,13 @@ class User(Base):
         nullable=False,
         comment="Indica si el usuario está activo"
     )
+    token_version = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Versión de los permisos; invalida tokens emitidos con una versión anterior"
+    )
     
     # Timestamps
     created_at = Column(
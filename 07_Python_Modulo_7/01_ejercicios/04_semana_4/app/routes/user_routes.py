@@ -1,65 +1,189 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from models.user_model import User
-from auth.auth_service import hashear_password, verificar_password
+from auth.auth_service import hash_async, verify_async, hash_many_async
 from auth.auth_handler import crear_token
-from auth.dependencies import get_current_user
-from schemas.user_schemas import UserCreate, UserLogin, UserResponse, Token, LoginResponse, Message
+from auth.refresh_service import emitir_refresh_token, rotar_refresh_token, RefreshTokenInvalido
+from auth.dependencies import get_current_user, require_role, limitar_login, limitar_login_usuario, limitar_registro, limitar_registro_bulk
+from auth.principal import Principal
+from auth.user_cache import usuario_json
+from core.respuestas import ORJSONResponse
+from schemas.user_schemas import UserCreate, UserLogin, UserResponse, Token, LoginResponse, Message, BulkRegisterItem, BulkRegisterResponse, RefreshRequest, TokenPair
 
 router = APIRouter(tags=["Autenticación"])  # Tag para documentación Swagger
 
-@router.post("/login", response_model=LoginResponse, summary="Iniciar sesión")
-def login(data: UserLogin, db: Session = Depends(get_db)):
+BULK_REGISTER_MAX = 1000  # Máximo de usuarios por petición de registro masivo
+
+@router.post("/login", response_model=LoginResponse, summary="Iniciar sesión", dependencies=[Depends(limitar_login)])
+async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Autentica un usuario y devuelve un token JWT junto con los datos del usuario.
     
     - **username**: Nombre de usuario
     - **password**: Contraseña del usuario
     
+    Los intentos están limitados por IP y por usuario (429 con Retry-After).
+    
     Retorna:
     - **access_token**: Token JWT para autenticación
     - **token_type**: Tipo de token (bearer)
+    - **refresh_token**: Token para renovar el acceso sin volver a enviar la contraseña
     - **user**: Datos del usuario autenticado
     """
-    user = db.query(User).filter(User.username == data.username).first()
+    await limitar_login_usuario(data.username)  # Antes de verificar la contraseña
     
-    if not user or not verificar_password(data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.username == data.username))
+    user = result.scalar_one_or_none()
+    
+    if not user or not await verify_async(data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
-    token = crear_token({"sub": user.username})
+    # El rol y la versión de permisos viajan en el token para autorizar sin consultar la base de datos
+    token = crear_token({"sub": user.username, "role": user.role, "ver": user.token_version})
+    refresh_token = await emitir_refresh_token(db, user.id)
+    await db.commit()
     
     return LoginResponse(
         access_token=token,
         token_type="bearer",
+        refresh_token=refresh_token,
         user=UserResponse.model_validate(user)
     )
 
-@router.post("/register", response_model=UserResponse, status_code=201, summary="Registrar nuevo usuario")
-def register(data: UserCreate, db: Session = Depends(get_db)):
+@router.post("/token/refresh", response_model=TokenPair, summary="Renovar el token de acceso")
+async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Emite un nuevo token de acceso a partir de un refresh token, sin verificar la contraseña.
+    
+    El refresh token recibido queda revocado y se devuelve uno nuevo (rotación).
+    Reutilizar un refresh token ya rotado revoca todas las sesiones del usuario.
+    """
+    try:
+        user_id, nuevo_refresh = await rotar_refresh_token(db, data.refresh_token)
+    except RefreshTokenInvalido as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+    result = await db.execute(
+        select(User.username, User.role, User.token_version, User.is_active).where(User.id == user_id)
+    )
+    user = result.one_or_none()
+    if not user or not user.is_active:
+        await db.rollback()
+        raise HTTPException(status_code=401, detail="Usuario no encontrado o inactivo", headers={"WWW-Authenticate": "Bearer"})
+
+    await db.commit()
+
+    token = crear_token({"sub": user.username, "role": user.role, "ver": user.token_version})
+    return TokenPair(access_token=token, token_type="bearer", refresh_token=nuevo_refresh)
+
+@router.post("/register", response_model=UserResponse, status_code=201, summary="Registrar nuevo usuario", dependencies=[Depends(limitar_registro)])
+async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Registra un nuevo usuario en el sistema.
     
     - **username**: Nombre de usuario único (mínimo 3 caracteres)
     - **password**: Contraseña (mínimo 6 caracteres)
     """
-    user = db.query(User).filter(User.username == data.username).first()
-    
-    if user:
+    hashed = await hash_async(data.password)  # El hash se calcula en el pool, fuera del event loop
+
+    # Construir el modelo aplica los @validates (normaliza el username)
+    nuevo_usuario = User(username=data.username, hashed_password=hashed, role=data.role)
+
+    # Un único viaje a la base de datos: si el username ya existe no se inserta nada
+    # y RETURNING viene vacío, sin ventana de carrera entre consulta e inserción
+    stmt = (
+        pg_insert(User)
+        .values(username=nuevo_usuario.username, hashed_password=nuevo_usuario.hashed_password, role=nuevo_usuario.role, is_active=True)
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User)
+    )
+    result = await db.execute(stmt)
+    creado = result.scalar_one_or_none()
+
+    if creado is None:
         raise HTTPException(status_code=400, detail="Usuario ya existe")
 
-    hashed = hashear_password(data.password)
+    await db.commit()  # Confirmamos los cambios en la base de datos
 
-    nuevo_usuario = User(username=data.username, hashed_password=hashed, role=data.role)
+    return UserResponse.model_validate(creado)
 
-    db.add(nuevo_usuario)
-    db.commit()  # Confirmamos los cambios en la base de datos
-    db.refresh(nuevo_usuario)  # Obtenemos la versión actualizada del usuario
+@router.post("/register/bulk", response_model=BulkRegisterResponse, summary="Registrar usuarios en lote")
+async def register_bulk(
+    request: Request,
+    data: List[UserCreate] = Body(..., min_length=1, max_length=BULK_REGISTER_MAX),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Registra varios usuarios en una sola petición.
+    
+    - Los duplicados se detectan con una única consulta `IN`
+    - Las contraseñas se hashean en paralelo en el pool de hashing
+    - Las filas se insertan con un único `INSERT ... ON CONFLICT DO NOTHING RETURNING`
+    
+    Cada usuario del lote consume un token del límite por IP (429 con Retry-After;
+    413 si el lote supera la capacidad del límite).
+    
+    Retorna el resultado de cada usuario en el mismo orden recibido.
+    """
+    await limitar_registro_bulk(request, len(data))  # Antes de calcular ningún hash
+    
+    resultados = [None] * len(data)
+    candidatos = {}  # username normalizado -> índice en data
+
+    for i, item in enumerate(data):
+        try:
+            # Construir el modelo aplica los mismos @validates que el registro individual
+            username = User(username=item.username).username
+        except ValueError as e:
+            resultados[i] = BulkRegisterItem(username=item.username, status="invalido", detail=str(e))
+            continue
+        if username in candidatos:
+            resultados[i] = BulkRegisterItem(username=username, status="duplicado", detail="Usuario repetido en el lote")
+            continue
+        candidatos[username] = i
+
+    if candidatos:
+        # Una sola consulta para todos los usuarios que ya existen
+        result = await db.execute(select(User.username).where(User.username.in_(candidatos)))
+        for username in result.scalars():
+            i = candidatos.pop(username)
+            resultados[i] = BulkRegisterItem(username=username, status="duplicado", detail="Usuario ya existe")
+
+    if candidatos:
+        usernames = list(candidatos)
+        hashes = await hash_many_async([data[candidatos[u]].password for u in usernames])
+        filas = [
+            {"username": u, "hashed_password": h, "role": data[candidatos[u]].role, "is_active": True}
+            for u, h in zip(usernames, hashes)
+        ]
 
-    return UserResponse.model_validate(nuevo_usuario)
+        # ON CONFLICT cubre los usuarios creados por otra petición entre la consulta y el INSERT
+        stmt = (
+            pg_insert(User)
+            .values(filas)
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User.id, User.username)
+        )
+        result = await db.execute(stmt)
+        insertados = {username: user_id for user_id, username in result.all()}
+        await db.commit()
+
+        for username in usernames:
+            i = candidatos[username]
+            if username in insertados:
+                resultados[i] = BulkRegisterItem(username=username, status="creado", id=insertados[username])
+            else:
+                resultados[i] = BulkRegisterItem(username=username, status="duplicado", detail="Usuario ya existe")
+
+    creados = sum(1 for r in resultados if r.status == "creado")
+    return BulkRegisterResponse(creados=creados, resultados=resultados)
 
 @router.get("/me", response_model=UserResponse, summary="Obtener usuario actual")
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     """
     Obtiene los datos del usuario autenticado actualmente.
     
@@ -73,16 +197,18 @@ async def get_me(current_user: User = Depends(get_current_user)):
     - **created_at**: Fecha de creación
     - **updated_at**: Fecha de última actualización
     """
-    return UserResponse.model_validate(current_user)
+    # JSON precodificado y cacheado junto al Principal: se evita validar y
+    # serializar UserResponse en cada petición (response_model queda para la documentación)
+    return Response(content=usuario_json(current_user), media_type="application/json")
 
-@router.get("/admin", summary="Ruta de administrador")
-async def admin_route(current_user: User = Depends(get_current_user)):
+@router.get("/admin", summary="Ruta de administrador", response_class=ORJSONResponse)
+async def admin_route(
+    claims: dict = Depends(require_role("admin", detail="Solo administradores pueden acceder a esta ruta"))
+):
     """
     Ruta protegida solo para administradores.
     
     Requiere autenticación mediante token JWT y rol de administrador.
+    La autorización se resuelve con los claims del token, sin consultar la base de datos.
     """
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Solo administradores pueden acceder a esta ruta")
-    
-    return {"message": f"Bienvenido, administrador {current_user.username}"}
+    return {"message": f"Bienvenido, administrador {claims['sub']}"}
@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 # ------------------------------------------------------------
 # Schema para crear un nuevo usuario (registro)
@@ -45,8 +45,37 @@ class LoginResponse(BaseModel):
     """Schema para la respuesta de login con token y datos del usuario"""
     access_token: str = Field(..., description="Token JWT de acceso", examples=["eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."])
     token_type: str = Field(default="bearer", description="Tipo de token", examples=["bearer"])
+    refresh_token: str = Field(..., description="Refresh token para renovar el token de acceso", examples=["Vb3k9Q2..."])
     user: UserResponse = Field(..., description="Datos del usuario autenticado")
 
+# ------------------------------------------------------------
+# Schema para solicitar un nuevo token de acceso
+class RefreshRequest(BaseModel):
+    """Schema para la renovación del token de acceso"""
+    refresh_token: str = Field(..., description="Refresh token vigente", examples=["Vb3k9Q2..."])
+
+# ------------------------------------------------------------
+# Schema para la respuesta de la renovación (tokens rotados)
+class TokenPair(Token):
+    """Schema con el nuevo token de acceso y el nuevo refresh token"""
+    refresh_token: str = Field(..., description="Nuevo refresh token (el anterior queda revocado)", examples=["Vb3k9Q2..."])
+
+# ------------------------------------------------------------
+# Schema para el resultado de cada usuario en un registro masivo
+class BulkRegisterItem(BaseModel):
+    """Resultado del registro de un usuario dentro de un lote"""
+    username: str = Field(..., description="Nombre de usuario enviado", examples=["juan_perez"])
+    status: Literal["creado", "duplicado", "invalido"] = Field(..., description="Resultado del registro", examples=["creado"])
+    id: Optional[int] = Field(default=None, description="ID asignado si el usuario fue creado", examples=[1])
+    detail: Optional[str] = Field(default=None, description="Motivo si no fue creado", examples=[None])
+
+# ------------------------------------------------------------
+# Schema para la respuesta del registro masivo
+class BulkRegisterResponse(BaseModel):
+    """Schema para la respuesta del registro masivo de usuarios"""
+    creados: int = Field(..., description="Cantidad de usuarios creados", examples=[2])
+    resultados: List[BulkRegisterItem] = Field(..., description="Resultado por usuario, en el orden recibido")
+
 # ------------------------------------------------------------
 # Schema para mensajes generales
 class Message(BaseModel):
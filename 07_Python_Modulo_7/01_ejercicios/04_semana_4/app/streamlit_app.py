@@ -14,6 +14,27 @@ if "token" not in st.session_state:
     st.session_state.token = None
 if "user" not in st.session_state:
     st.session_state.user = None
+if "refresh_token" not in st.session_state:
+    st.session_state.refresh_token = None
+
+def renovar_token():
+    """Obtiene un nuevo token de acceso con el refresh token, sin volver a hacer login"""
+    if not st.session_state.refresh_token:
+        return False
+    r = requests.post(f"{API_BASE_URL}/token/refresh", json={"refresh_token": st.session_state.refresh_token})
+    if r.status_code != 200:
+        st.session_state.refresh_token = None
+        return False
+    st.session_state.token = r.json()["access_token"]
+    st.session_state.refresh_token = r.json()["refresh_token"]  # El refresh token rota en cada uso
+    return True
+
+def get_autenticado(ruta: str):
+    """GET con el token actual; si expiró, lo renueva y reintenta una vez"""
+    r = requests.get(f"{API_BASE_URL}{ruta}", headers={"Authorization": f"Bearer {st.session_state.token}"})
+    if r.status_code == 401 and renovar_token():
+        r = requests.get(f"{API_BASE_URL}{ruta}", headers={"Authorization": f"Bearer {st.session_state.token}"})
+    return r
 
 if choice == "Registro":
     st.subheader("Crear nuevo usuario")
@@ -62,13 +83,12 @@ if choice == "Login":
                 try:
                     r = requests.post(f"{API_BASE_URL}/login", json=data)
                     if r.status_code == 200:
-                        token = r.json()["access_token"]
-                        st.session_state.token = token
+                        st.session_state.token = r.json()["access_token"]
+                        st.session_state.refresh_token = r.json()["refresh_token"]
                         st.success("✅ Login exitoso")
                         
                         # Obtener datos de usuario
-                        headers = {"Authorization": f"Bearer {token}"}
-                        r2 = requests.get(f"{API_BASE_URL}/me", headers=headers)
+                        r2 = get_autenticado("/me")
                         if r2.status_code == 200:
                             st.session_state.user = r2.json()
                         else:
@@ -83,9 +103,8 @@ if choice == "Login":
         # Mostrar información específica según el rol
         if st.session_state.user['role'] == "admin":
             # Probar acceso a ruta de administrador
-            headers = {"Authorization": f"Bearer {st.session_state.token}"}
             try:
-                r = requests.get(f"{API_BASE_URL}/admin", headers=headers)
+                r = get_autenticado("/admin")
                 if r.status_code == 200:
                     st.success("✅ Acceso confirmado a funciones de administrador")
                 else:
@@ -96,6 +115,7 @@ if choice == "Login":
         # Botón para cerrar sesión
         if st.button("🚪 Cerrar Sesión"):
             st.session_state.token = None
+            st.session_state.refresh_token = None
             st.session_state.user = None
             st.success("✅ Sesión cerrada correctamente")
             st.rerun()
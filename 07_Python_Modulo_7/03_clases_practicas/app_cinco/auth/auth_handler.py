@@ -7,6 +7,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
+# Con varios workers (WEB_CONCURRENCY lo fija python -m core.servidor) cada uno
+# generaría su propia clave y rechazaría los tokens firmados por los demás
+if not SECRET_KEY and int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+    raise RuntimeError("SECRET_KEY no está configurada y la app se ejecuta con varios workers")
 if not SECRET_KEY:
     SECRET_KEY = secrets.token_urlsafe(32)
     print(f"ADVERTENCIA: SECRET_KEY no encontrado en .env")
@@ -0,0 +1,72 @@
+# core/migraciones.py
+#
+# Migraciones del esquema con Alembic.
+#
+# El esquema se crea y actualiza con un comando explícito, una vez por
+# despliegue, en lugar de ejecutar create_all() al arrancar cada worker.
+# Desde la carpeta de la app:
+#
+#   python -m core.migraciones           # aplica las migraciones pendientes
+#   python -m core.migraciones stamp     # marca como actualizada una base creada con create_all()
+#   python -m core.migraciones actual    # muestra la revisión de la base
+#
+# Al arrancar, la app solo comprueba que la base esté en la revisión esperada.
+
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class EsquemaDesactualizado(RuntimeError):
+    """La base de datos no está en la revisión de migraciones que espera el código"""
+
+def _config(configurar_logging: bool = True) -> Config:
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    config.attributes["configurar_logging"] = configurar_logging
+    return config
+
+def revision_esperada() -> str:
+    """Última revisión definida en migrations/versions (se lee de disco, sin base de datos)"""
+    return ScriptDirectory.from_config(_config()).get_current_head()
+
+def verificar_esquema(connection) -> str:
+    """
+    Comprueba que la base está en la revisión esperada y la devuelve.
+
+    Uso: with engine.connect() as conn: verificar_esquema(conn)
+
+    Raises:
+        EsquemaDesactualizado: Si faltan migraciones por aplicar (o la base es más nueva)
+    """
+    actual = MigrationContext.configure(connection).get_current_revision()
+    esperada = revision_esperada()
+    if actual != esperada:
+        raise EsquemaDesactualizado(
+            f"La base de datos está en la revisión {actual} y el código espera {esperada}. "
+            f"Ejecute: python -m core.migraciones"
+        )
+    return actual
+
+def migrar(configurar_logging: bool = False):
+    """Aplica todas las migraciones pendientes (upgrade head)"""
+    command.upgrade(_config(configurar_logging), "head")
+
+def main():
+    orden = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if orden == "upgrade":
+        migrar(configurar_logging=True)
+    elif orden == "stamp":
+        command.stamp(_config(), "head")
+    elif orden == "actual":
+        command.current(_config(), verbose=True)
+    else:
+        print("Uso: python -m core.migraciones [upgrade|stamp|actual]")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
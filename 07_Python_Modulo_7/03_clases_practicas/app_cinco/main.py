@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from core.database import Base, engine
+from core.database import engine, log_pool_config, estado_pool
+from core.migraciones import verificar_esquema
+from core.respuestas import ORJSONResponse
 from routes.user_routes import router as user_router
 import logging
 from contextlib import asynccontextmanager
@@ -16,8 +17,10 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("DB inicializada de forma correcta")
+        with engine.connect() as conn:
+            revision = verificar_esquema(conn)  # El esquema se crea con: python -m core.migraciones
+        logger.info(f"DB en la revisión de esquema {revision}")
+        log_pool_config()
     except Exception as e:
         logger.error(f"Error al inicializar la DB: {str(e)}")
         raise
@@ -44,14 +47,19 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Error no manejado: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Error interno del servidor"}
     )
 
+@app.get("/health/db", tags=["Salud"], summary="Estado del pool de conexiones", response_class=ORJSONResponse)
+def health_db():
+    return estado_pool()
+
 app.include_router(user_router, prefix="/api/v1")
 
 def main():
+    """Servidor de desarrollo con hot-reload (producción: python -m core.servidor)"""
     import uvicorn
     import webbrowser
     from threading import Timer
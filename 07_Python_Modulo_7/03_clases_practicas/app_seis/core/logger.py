@@ -1,14 +1,73 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop")  # "drop" descarta si la cola está llena, "block" espera
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON"""
+
+    def format(self, record):
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Encola los registros sin formatearlos; el formateo y la escritura en disco
+    ocurren en el hilo del QueueListener. Con la cola llena descarta o espera
+    según la política configurada.
+    """
+
+    def __init__(self, log_queue, bloquear: bool = False):
+        super().__init__(log_queue)
+        self.bloquear = bloquear
+        self.descartados = 0
+
+    def prepare(self, record):
+        # Solo resolvemos el mensaje (msg % args) para no retener objetos mutables
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.bloquear:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
 
 def init_logger():
     os.makedirs('logs', exist_ok=True)
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
+    if logger.handlers:
+        return None
+
     handler = TimedRotatingFileHandler('logs/app.log', when='midnight', backupCount=7, encoding='utf-8')
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    formatter = JsonFormatter() if LOG_JSON else logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
-    if not logger.handlers:
-        logger.addHandler(handler)
 
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    logger.addHandler(BoundedQueueHandler(log_queue, bloquear=LOG_QUEUE_POLICY == "block"))
+
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Vacía la cola y cierra el archivo al terminar el proceso
+    return listener